@@ -0,0 +1,246 @@
+"""Offline benchmarks of the scheduling, refresh and persistence hot paths.
+
+Builds a synthetic deployment of fake guilds, channels and roles together with a
+synthetic clist contest db, times each hot path of the `Reminders` cog, records its
+peak traced memory and writes the results as JSON. Results are compared against a
+stored baseline so that regressions show up.
+
+    python -m benchmarks.bench_hot_paths --scale small medium
+    python -m benchmarks.bench_hot_paths --scale small --save-baseline
+"""
+import argparse
+import asyncio
+import datetime as dt
+import json
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from remind import constants
+from remind.util import website_schema
+from remind.util import tiers
+
+# (guilds, contests). Every guild arms real reminder tasks, about two per contest and
+# tier, so a scale is bounded by the millions of tasks it creates rather than by clist.
+SCALES = {
+    'small': (10, 500),
+    'medium': (1000, 500),
+    'large': (2000, 500),
+}
+_DEFAULT_BASELINE_PATH = Path(__file__).with_name('baseline.json')
+_DEFAULT_OUTPUT_PATH = Path(__file__).with_name('bench_output.json')
+_DEFAULT_TOLERANCE = 0.2
+
+_EVENT_NAMES = {
+    'codeforces.com': ['Codeforces Round #{} (Div. 1)', 'Codeforces Round #{} (Div. 2)', 'Educational Round {}'],
+    'codechef.com': ['Starters {}', 'CodeChef Long Challenge {}'],
+    'atcoder.jp': ['AtCoder Beginner Contest {}', 'AtCoder Regular Contest {}', 'AtCoder Grand Contest {}'],
+    'facebook.com/hackercup': ['Meta Hacker Cup Round {}'],
+    'tlx.toki.id': ['TLX Regular Open Contest #{}'],
+}
+
+
+class FakeRole:
+    def __init__(self, role_id):
+        self.id = role_id
+        self.mention = f'<@&{role_id}>'
+        self.members = []
+
+
+class FakeChannel:
+    def __init__(self, channel_id, guild):
+        self.id = channel_id
+        self.guild = guild
+
+    async def send(self, *args, **kwargs):
+        raise RuntimeError('Benchmarks never send messages')
+
+
+class FakeGuild:
+    def __init__(self, guild_id):
+        self.id = guild_id
+        self.name = f'guild-{guild_id}'
+        self.channels = {guild_id * 10 + i: FakeChannel(guild_id * 10 + i, self) for i in range(2)}
+        self.roles = {guild_id * 10 + i: FakeRole(guild_id * 10 + i) for i in range(2)}
+
+    def get_channel(self, channel_id):
+        return self.channels.get(channel_id)
+
+    def get_role(self, role_id):
+        return self.roles.get(role_id)
+
+    def __str__(self):
+        return self.name
+
+
+class FakeBot:
+    def __init__(self, guild_count):
+        self.guilds = [FakeGuild(guild_id) for guild_id in range(1, guild_count + 1)]
+        self._guild_map = {guild.id: guild for guild in self.guilds}
+        self.user = None
+        self.latency = 0.0
+
+    def get_guild(self, guild_id):
+        return self._guild_map.get(guild_id)
+
+    def get_channel(self, channel_id):
+        guild = self._guild_map.get(channel_id // 10)
+        return guild and guild.get_channel(channel_id)
+
+
+def make_contests(contest_count, seed=0):
+    rng = random.Random(seed)
+    now = dt.datetime.utcnow()
+    websites = list(_EVENT_NAMES)
+    contests = []
+    for contest_id in range(contest_count):
+        website = rng.choice(websites)
+        start = now + dt.timedelta(minutes=rng.randint(-3 * 24 * 60, 30 * 24 * 60))
+        contests.append({
+            'id': contest_id,
+            'event': rng.choice(_EVENT_NAMES[website]).format(contest_id),
+            'start': start.strftime('%Y-%m-%dT%H:%M:%S'),
+            'duration': rng.choice([90, 120, 180, 300]) * 60,
+            'href': f'https://{website}/contest/{contest_id}',
+            'resource': website,
+        })
+    return contests
+
+
+def configure_guild(cog, guild):
+    """Subscribes the guild to every website with two reminders in every tier."""
+    settings = cog.guild_map[guild.id]
+    channel_ids, role_ids = list(guild.channels), list(guild.roles)
+    for i, tier in enumerate(tiers.TIERS):
+        tier_settings = settings[tier.name]
+        tier_settings.remind_channel_id = channel_ids[i % len(channel_ids)]
+        tier_settings.remind_role_id = role_ids[i % len(role_ids)]
+        tier_settings.remind_before = [60, 10]
+        tier_settings.finalcall_channel_id = channel_ids[i % len(channel_ids)]
+        tier_settings.finalcall_before = 5
+        tier_settings.subscribed_websites = website_schema.ALL_WEBSITES_MASK
+
+
+def cancel_all_tasks(cog):
+    for task_map in cog.task_maps.values():
+        for tasks in task_map.values():
+            for task in tasks:
+                task.cancel()
+            tasks.clear()
+
+
+async def measure(func, repeat):
+    """Returns the best wall time of `repeat` runs and the peak traced memory of one run.
+
+    The loop gets to run between runs, cancelled reminder tasks are only freed once it does.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+        await asyncio.sleep(0)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    await asyncio.sleep(0)
+    return {'seconds': best, 'peak_bytes': peak}
+
+
+async def run_scale(scale, repeat):
+    from remind.cogs.reminders import Reminders, filter_contests
+
+    guild_count, contest_count = SCALES[scale]
+    with tempfile.TemporaryDirectory() as data_dir:
+        constants.CONTESTS_DB_FILE_PATH = str(Path(data_dir, 'contests.json'))
+        constants.GUILD_SETTINGS_MAP_PATH = str(Path(data_dir, 'guild_settings_map'))
+        constants.SHARED_GUILD_SETTINGS_MAP_PATH = constants.GUILD_SETTINGS_MAP_PATH
+        constants.SCHEDULE_SNAPSHOT_PATH = str(Path(data_dir, 'schedule_snapshot'))
+        constants.REMINDER_OUTBOX_PATH = str(Path(data_dir, 'reminder_outbox.jsonl'))
+        constants.PERSONAL_SUBSCRIPTIONS_PATH = str(Path(data_dir, 'personal_subscriptions'))
+        # A fresh querytime keeps clist from being queried.
+        with open(constants.CONTESTS_DB_FILE_PATH, 'w') as f:
+            json.dump({'querytime': dt.datetime.utcnow().timestamp(), 'objects': make_contests(contest_count)}, f)
+
+        bot = FakeBot(guild_count)
+        cog = Reminders(bot)
+        for guild in bot.guilds:
+            configure_guild(cog, guild)
+
+        def refresh():
+            cog._refresh_contests()
+            cancel_all_tasks(cog)
+
+        def reschedule():
+            cog._reschedule_all_tasks()
+            cancel_all_tasks(cog)
+
+        def guild_contests():
+            for guild in bot.guilds:
+                cog.get_guild_contests(cog.contest_lists['all']['future'], guild.id, tiers.ALL)
+
+        def filters():
+            for _ in bot.guilds:
+                filter_contests(('+cf', '+ac'), cog.contest_lists['all']['future'])
+
+        results = {
+            'refresh': await measure(refresh, repeat),
+            'reschedule_all': await measure(reschedule, repeat),
+            'get_guild_contests': await measure(guild_contests, repeat),
+            'filter_contests': await measure(filters, repeat),
+            'serialize_guild_map': await measure(cog._serialize_guild_map, repeat),
+        }
+        cancel_all_tasks(cog)
+        return results
+
+
+def compare(results, baseline, tolerance):
+    """Returns a line per hot path that got slower than its baseline by more than `tolerance`."""
+    regressions = []
+    for scale, paths in results.items():
+        for path, result in paths.items():
+            expected = baseline.get(scale, {}).get(path)
+            if expected and result['seconds'] > expected['seconds'] * (1 + tolerance):
+                regressions.append(f'{scale}/{path}: {result["seconds"]:.4f}s '
+                                   f'vs baseline {expected["seconds"]:.4f}s')
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', nargs='+', choices=SCALES, default=['small', 'medium'])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default=str(_DEFAULT_OUTPUT_PATH))
+    parser.add_argument('--baseline', default=str(_DEFAULT_BASELINE_PATH))
+    parser.add_argument('--tolerance', type=float, default=_DEFAULT_TOLERANCE)
+    parser.add_argument('--save-baseline', action='store_true')
+    args = parser.parse_args(argv)
+
+    results = {scale: asyncio.run(run_scale(scale, args.repeat)) for scale in args.scale}
+    for scale, paths in results.items():
+        for path, result in paths.items():
+            print(f'{scale:<7} {path:<20} {result["seconds"] * 1000:>10.2f} ms '
+                  f'{result["peak_bytes"] / 2 ** 20:>9.2f} MiB')
+
+    output = {'python': sys.version.split()[0], 'timestamp': time.time(), 'results': results}
+    Path(args.output).write_text(json.dumps(output, indent=2))
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline_path.write_text(json.dumps(results, indent=2))
+        return 0
+    if not baseline_path.exists():
+        return 0
+    regressions = compare(results, json.loads(baseline_path.read_text()), args.tolerance)
+    for regression in regressions:
+        print(f'REGRESSION {regression}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
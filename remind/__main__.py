@@ -1,8 +1,12 @@
 import os
+import sys
+import time
 import asyncio
 import discord
 import logging
-from logging.handlers import TimedRotatingFileHandler
+import queue
+import atexit
+from logging.handlers import TimedRotatingFileHandler, QueueHandler, QueueListener
 from remind import constants
 
 from discord.ext import commands
@@ -10,6 +14,11 @@ from dotenv import load_dotenv
 from pathlib import Path
 from remind.util import discord_common
 from remind.util import clist_api
+from remind import cluster
+from remind.util import leader
+from remind.util import metrics
+from remind.util import http_server
+from remind.util.watchdog import LoopWatchdog
 
 
 def setup():
@@ -26,31 +35,36 @@ def setup():
         reset = "\x1b[0m"
         format = "%(asctime)s - %(levelname)s - %(name)s - %(message)s (%(filename)s:%(lineno)d)"
 
-        FORMATS = {
-            logging.DEBUG: cyan + format + reset,
-            logging.INFO: grey + format + reset,
-            logging.WARNING: yellow + format + reset,
-            logging.ERROR: red + format + reset,
-            logging.CRITICAL: bold_red + format + reset
+        FORMATTERS = {
+            logging.DEBUG: logging.Formatter(cyan + format + reset),
+            logging.INFO: logging.Formatter(grey + format + reset),
+            logging.WARNING: logging.Formatter(yellow + format + reset),
+            logging.ERROR: logging.Formatter(red + format + reset),
+            logging.CRITICAL: logging.Formatter(bold_red + format + reset)
         }
+        DEFAULT_FORMATTER = logging.Formatter(format)
 
         def format(self, record):
-            log_fmt = self.FORMATS.get(record.levelno)
-            formatter = logging.Formatter(log_fmt)
-            return formatter.format(record)
+            return self.FORMATTERS.get(record.levelno, self.DEFAULT_FORMATTER).format(record)
 
     ch = logging.StreamHandler()
     ch.setFormatter(CustomFormatter())
+    fh = TimedRotatingFileHandler(constants.LOG_FILE_PATH, when='D', backupCount=3, utc=True)
+    fh.setFormatter(logging.Formatter(fmt='{asctime}:{levelname}:{name}:{message}',
+                                      style='{',
+                                      datefmt='%d-%m-%Y %H:%M:%S'))
+    # Console and file writes happen on a background thread instead of the event loop.
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, ch, fh, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
     # logging to console and file on daily interval
-    logging.basicConfig(format='{asctime}:{levelname}:{name}:{message}',
-                        style='{',
-                        datefmt='%d-%m-%Y %H:%M:%S',
-                        level=logging.INFO,
-                        handlers=[ch,
-                                  TimedRotatingFileHandler(constants.LOG_FILE_PATH, when='D', backupCount=3, utc=True)])
+    logging.basicConfig(level=(os.getenv('LOG_LEVEL') or 'INFO').upper(),
+                        handlers=[QueueHandler(log_queue)])
 
 
 async def main():
+    constants.PROCESS_START_TIME = time.time()
     load_dotenv()
 
     token = os.getenv('BOT_TOKEN_REMIND')
@@ -68,16 +82,48 @@ async def main():
     if remind_moderator_role:
         constants.REMIND_MODERATOR_ROLE = remind_moderator_role
 
+    metrics_port = os.getenv('METRICS_PORT')
+    if metrics_port:
+        constants.METRICS_PORT = int(metrics_port)
+
+    ical_port = os.getenv('ICAL_PORT')
+    if ical_port:
+        constants.ICAL_PORT = int(ical_port)
+
+    cluster_id = os.getenv('CLUSTER_ID')
+    if cluster_id is not None:
+        constants.CLUSTER_ID = int(cluster_id)
+        constants.GUILD_SETTINGS_MAP_PATH += f'_cluster{cluster_id}'
+        constants.SCHEDULE_SNAPSHOT_PATH += f'_cluster{cluster_id}'
+        constants.REMINDER_OUTBOX_PATH += f'_cluster{cluster_id}'
+        constants.PERSONAL_SUBSCRIPTIONS_PATH += f'_cluster{cluster_id}'
+        # Every worker listens on its own ports, serving its own guilds' metrics and feeds.
+        if constants.METRICS_PORT is not None:
+            constants.METRICS_PORT += constants.CLUSTER_ID
+        if constants.ICAL_PORT is not None:
+            constants.ICAL_PORT += constants.CLUSTER_ID
+        constants.LOG_FILE_PATH = os.path.join(constants.LOGS_DIR, f'remind_cluster{cluster_id}.log')
+
     setup()
 
     intents = discord.Intents.default()
     intents.members = True
+    # Needed for the `t;` command prefix only, reminders get their reaction when they are sent.
     intents.message_content = True
-    bot = commands.Bot(command_prefix=commands.when_mentioned_or('t;'), intents=intents)
+    command_prefix = commands.when_mentioned_or('t;')
+    shard_count = os.getenv('SHARD_COUNT')
+    if shard_count:
+        shard_ids = os.getenv('SHARD_IDS')
+        bot = commands.AutoShardedBot(
+            command_prefix=command_prefix, intents=intents,
+            shard_count=None if shard_count == 'auto' else int(shard_count),
+            shard_ids=list(map(int, shard_ids.split(','))) if shard_ids else None)
+        logging.info(f'Running shards {shard_ids or "all"} of {shard_count}')
+    else:
+        bot = commands.Bot(command_prefix=command_prefix, intents=intents)
 
     cogs = [file.stem for file in Path('remind', 'cogs').glob('*.py')]
-    for extension in cogs:
-        await bot.load_extension(f'remind.cogs.{extension}')
+    await asyncio.gather(*(bot.load_extension(f'remind.cogs.{extension}') for extension in cogs))
     logging.info(f'Cogs loaded: {", ".join(bot.cogs)}')
 
     async def no_dm_usage_check(ctx):
@@ -88,9 +134,32 @@ async def main():
     # Restrict bot usage to inside guild channels only.
     bot.add_check(no_dm_usage_check)
 
+    ha_lease_path = os.getenv('HA_LEASE_PATH')
+    if ha_lease_path:
+        election = leader.start(ha_lease_path, float(os.getenv('HA_LEASE_TTL') or 10))
+        logging.info(f'High availability mode, starting {"as leader" if election.is_leader else "on standby"}')
+
+        @bot.event
+        async def on_message(message):
+            # Only the leader answers commands, a standby stays silent.
+            if leader.is_leader():
+                await bot.process_commands(message)
+
+    LoopWatchdog(threshold=float(os.getenv('LOOP_LAG_THRESHOLD') or 0.5)).start()
+
+    if constants.METRICS_PORT is not None:
+        metrics.gauge('remind_asyncio_tasks', 'Live asyncio tasks', lambda: len(asyncio.all_tasks()))
+        metrics.gauge('remind_gateway_latency_seconds', 'Discord gateway heartbeat latency', lambda: bot.latency)
+        metrics.enable(constants.METRICS_PORT)
+        await http_server.start(os.getenv('METRICS_HOST') or '127.0.0.1', constants.METRICS_PORT)
+
+    if constants.ICAL_PORT is not None:
+        await http_server.start(os.getenv('ICAL_HOST') or '127.0.0.1', constants.ICAL_PORT)
+
     @discord_common.on_ready_event_once(bot)
     async def init():
-        clist_api.cache()
+        logging.info(f'Connected {time.time() - constants.PROCESS_START_TIME:.2f}s after launch')
+        await asyncio.get_running_loop().run_in_executor(None, clist_api.cache)
         asyncio.create_task(discord_common.presence(bot))
 
     bot.add_listener(discord_common.bot_error_handler, name='on_command_error')
@@ -98,4 +167,9 @@ async def main():
 
 
 if __name__ == '__main__':
+    load_dotenv()
+    if int(os.getenv('CLUSTER_COUNT') or 1) > 1 and os.getenv('CLUSTER_ID') is None:
+        # The supervisor logs to the default log file, workers to their own.
+        setup()
+        sys.exit(cluster.run_from_env())
     asyncio.run(main())
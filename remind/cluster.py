@@ -0,0 +1,64 @@
+import logging
+import os
+import signal
+import subprocess
+import sys
+import time
+
+logger = logging.getLogger(__name__)
+
+_POLL_PERIOD = 1  # seconds
+
+
+def shard_ids_for_cluster(cluster_id, cluster_count, shard_count):
+    return [shard_id for shard_id in range(shard_count) if shard_id % cluster_count == cluster_id]
+
+
+def _spawn_worker(cluster_id, shard_ids, shard_count):
+    env = dict(os.environ)
+    env['CLUSTER_ID'] = str(cluster_id)
+    env['SHARD_COUNT'] = str(shard_count)
+    env['SHARD_IDS'] = ','.join(map(str, shard_ids))
+    return subprocess.Popen([sys.executable, '-m', 'remind'], env=env)
+
+
+def run_from_env():
+    token = os.getenv('BOT_TOKEN_REMIND')
+    if not token:
+        logger.error('Token required')
+        return 1
+    shard_count = os.getenv('SHARD_COUNT')
+    # Which worker owns a guild depends on the shard count, and each worker keeps its own
+    # guild settings file, so a shard count left to Discord would strand settings when it changes.
+    if not shard_count or not shard_count.isdigit():
+        logger.error('CLUSTER_COUNT requires SHARD_COUNT to be set to a fixed number')
+        return 1
+    return run(int(os.getenv('CLUSTER_COUNT')), int(shard_count))
+
+
+def run(cluster_count, shard_count):
+    """Runs the bot as `cluster_count` worker processes, each owning a share of the shards.
+
+    Workers are supervised: when one of them exits the others are stopped and its
+    exit code is returned, so that `run.sh` restarts the whole cluster on `t;meta restart`.
+    """
+    cluster_count = min(cluster_count, shard_count)
+    logger.info(f'Starting {cluster_count} clusters for {shard_count} shards')
+
+    workers = [_spawn_worker(cluster_id, shard_ids_for_cluster(cluster_id, cluster_count, shard_count), shard_count)
+               for cluster_id in range(cluster_count)]
+    try:
+        while True:
+            for cluster_id, worker in enumerate(workers):
+                code = worker.poll()
+                if code is not None:
+                    log = logger.info if code == 0 else logger.error
+                    log(f'Cluster {cluster_id} exited with code {code}, stopping the others')
+                    return code
+            time.sleep(_POLL_PERIOD)
+    finally:
+        for worker in workers:
+            if worker.poll() is None:
+                worker.send_signal(signal.SIGTERM)
+        for worker in workers:
+            worker.wait()
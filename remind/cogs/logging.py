@@ -4,17 +4,56 @@ import os
 
 from discord.ext import commands
 from remind.util import discord_common
+from remind.util import metrics
 
 root_logger = logging.getLogger()
 logger = logging.getLogger(__name__)
 
+_MESSAGE_LIMIT = 2000
+_CODE_BLOCK_LENGTH = len('``````')
+_FLUSH_INTERVAL = 5  # seconds
+_QUEUE_SIZE = 1000
+
+_DROPPED_RECORDS = metrics.counter('remind_log_records_dropped',
+                                   'Log records dropped because the Discord log queue was full')
+
+
+def _fold_repeats(records):
+    """Maps each distinct record to its first occurrence and number of repeats, in order."""
+    folded = {}
+    for record in records:
+        key = (record.levelno, record.name, record.getMessage())
+        if key in folded:
+            folded[key][1] += 1
+        else:
+            folded[key] = [record, 1]
+    return folded.values()
+
+
+def _pack_lines(lines, limit):
+    """Packs lines into as few chunks of at most `limit` characters as possible, keeping their order."""
+    chunks = []
+    current = ''
+    for line in lines:
+        if len(line) > limit:
+            line = line[:limit - 3] + '...'
+        if current and len(current) + 1 + len(line) > limit:
+            chunks.append(current)
+            current = ''
+        current = f'{current}\n{line}' if current else line
+    if current:
+        chunks.append(current)
+    return chunks
+
 
 class Logging(commands.Cog, logging.Handler):
     def __init__(self, bot, channel_id):
         logging.Handler.__init__(self)
         self.bot = bot
         self.channel_id = channel_id
-        self.queue = asyncio.Queue()
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=_QUEUE_SIZE)
+        self.dropped = 0
         self.task = None
         self.logger = logging.getLogger(self.__class__.__name__)
 
@@ -31,7 +70,12 @@ class Logging(commands.Cog, logging.Handler):
 
     async def _log_task(self):
         while True:
-            record = await self.queue.get()
+            records = [await self.queue.get()]
+            # Give an error storm the time to pile up so that it goes out in a few messages.
+            await asyncio.sleep(_FLUSH_INTERVAL)
+            while not self.queue.empty():
+                records.append(self.queue.get_nowait())
+
             channel = self.bot.get_channel(self.channel_id)
             if channel is None:
                 # Channel no longer exists.
@@ -40,16 +84,39 @@ class Logging(commands.Cog, logging.Handler):
                     'Logging channel not available,'
                     'disabling Discord log handler.')
                 break
-            try:
-                msg = self.format(record)
-                await channel.send('```{}```'.format(msg))
-            except BaseException:
-                self.handleError(record)
+            lines = []
+            for record, count in _fold_repeats(records):
+                try:
+                    msg = self.format(record)
+                except BaseException:
+                    self.handleError(record)
+                    continue
+                lines.append(msg if count == 1 else f'{msg} (x{count})')
+            if self.dropped:
+                lines.append(f'{self.dropped} log records dropped, the log queue was full')
+                self.dropped = 0
+            for chunk in _pack_lines(lines, _MESSAGE_LIMIT - _CODE_BLOCK_LENGTH):
+                try:
+                    await channel.send('```{}```'.format(chunk))
+                except BaseException:
+                    self.handleError(records[-1])
+
+    def _enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            _DROPPED_RECORDS.inc()
 
     # logging.Handler overrides below.
 
     def emit(self, record):
-        self.queue.put_nowait(record)
+        # Records also come from executor and logging threads, the queue belongs to the event loop.
+        try:
+            self.loop.call_soon_threadsafe(self._enqueue, record)
+        except RuntimeError:
+            # The event loop is closed.
+            pass
 
     def close(self):
         if self.task:
@@ -1,17 +1,26 @@
+import asyncio
+import cProfile
 import os
+import pstats
 import subprocess
 import sys
 import time
 import textwrap
+import tracemalloc
 
 from discord.ext import commands
 from remind.util.discord_common import pretty_time_format
 from remind.util import clist_api
+from remind.util.lateness import tracker as lateness_tracker
 from remind import constants
 
 from remind.util import discord_common
 
 RESTART = 42
+_MAX_PROFILE_SECONDS = 120
+_PROFILE_TOP = 15
+_MEMORY_TOP = 10
+_MESSAGE_LIMIT = 1900
 
 
 # Adapted from numpy sources.
@@ -42,6 +51,19 @@ def git_history():
         return "Fetching git info failed"
 
 
+def _format_profile(profiler):
+    stats = pstats.Stats(profiler).stats
+    rows = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:_PROFILE_TOP]
+    lines = [f'{"cumtime":>8} {"tottime":>8} {"calls":>7}  function']
+    for (filename, lineno, func), (_, calls, tottime, cumtime, _) in rows:
+        lines.append(f'{cumtime:8.3f} {tottime:8.3f} {calls:>7}  {func} ({os.path.basename(filename)}:{lineno})')
+    return '\n'.join(lines)
+
+
+def _truncate(text):
+    return text if len(text) <= _MESSAGE_LIMIT else text[:_MESSAGE_LIMIT] + '\n...'
+
+
 def check_if_superuser(ctx):
     return ctx.author.id in constants.SUPER_USERS
 
@@ -50,6 +72,14 @@ class Meta(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.start_time = time.time()
+        self.profiling = False
+        self.memory_snapshot = None
+
+    def _save_schedule_snapshot(self):
+        # os._exit skips cog unloading, so save the snapshot for a warm start first.
+        reminders = self.bot.get_cog('Reminders')
+        if reminders is not None:
+            reminders.save_schedule_snapshot()
 
     @commands.group(brief='Bot control', invoke_without_command=True)
     async def meta(self, ctx):
@@ -63,6 +93,7 @@ class Meta(commands.Cog):
         # Really, we just exit with a special code
         # the magic is handled elsewhere
         await ctx.send('Restarting...')
+        self._save_schedule_snapshot()
         os._exit(RESTART)
 
     @meta.command(brief='Kill Remind')
@@ -70,6 +101,7 @@ class Meta(commands.Cog):
     async def kill(self, ctx):
         """Restarts the bot."""
         await ctx.send('Dying...')
+        self._save_schedule_snapshot()
         os._exit(0)
 
     @meta.command(brief='Is Remind up?')
@@ -115,6 +147,77 @@ class Meta(commands.Cog):
         except BaseException:
             await ctx.send('```' + 'Cache reset failed.' + '```')
 
+    @meta.command(brief='Reminder delivery lateness')
+    async def stats(self, ctx, scope: str = 'guild'):
+        """Replies with p50/p95/p99 lateness of reminders and final calls per tier,
+        for this guild or, with `all`, across all guilds.
+
+        Dispatch is when the bot woke up to send, ack when Discord accepted the message.
+        """
+        guild_id = None if scope == 'all' else ctx.guild.id
+        rows = lateness_tracker.summary(guild_id)
+        if not rows:
+            await ctx.send('```No reminders delivered yet```')
+            return
+
+        def fmt(values):
+            return ' / '.join(f'{value:.2f}s' for value in values)
+
+        lines = [f'{"tier":<5} {"kind":<9} {"n":>4}  dispatch p50/p95/p99      ack p50/p95/p99']
+        for tier, kind, count, dispatched, acknowledged in rows:
+            lines.append(f'{tier:<5} {kind:<9} {count:>4}  {fmt(dispatched):<25} {fmt(acknowledged)}')
+        await ctx.send('```' + '\n'.join(lines) + '```')
+
+    @meta.command(brief='Profile the running bot')
+    @commands.check(check_if_superuser)
+    async def profile(self, ctx, seconds: int = 10):
+        """Profiles the event loop for the given number of seconds and replies with
+        the top functions by cumulative time."""
+        if self.profiling:
+            await ctx.send('```A profile is already running```')
+            return
+        seconds = max(1, min(seconds, _MAX_PROFILE_SECONDS))
+        await ctx.send(f'Profiling for {seconds} seconds...')
+        self.profiling = True
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            profiler.disable()
+            self.profiling = False
+        await ctx.send('```' + _truncate(_format_profile(profiler)) + '```')
+
+    @meta.command(brief='Diff memory allocations')
+    @commands.check(check_if_superuser)
+    async def memory(self, ctx, action: str = 'snapshot'):
+        """Takes a tracemalloc snapshot and lists the allocation sites that grew since
+        the previous one. The first call starts tracing, `t;meta memory stop` ends it."""
+        if action == 'stop':
+            tracemalloc.stop()
+            self.memory_snapshot = None
+            await ctx.send('```Memory tracing stopped```')
+            return
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.memory_snapshot = None
+        snapshot = tracemalloc.take_snapshot()
+        previous, self.memory_snapshot = self.memory_snapshot, snapshot
+        if previous is None:
+            current, peak = tracemalloc.get_traced_memory()
+            await ctx.send(f'```Memory tracing started, {current / 2 ** 20:.1f} MiB traced '
+                           f'(peak {peak / 2 ** 20:.1f} MiB). Run again to see what grew.```')
+            return
+
+        grown = [stat for stat in snapshot.compare_to(previous, 'lineno') if stat.size_diff > 0][:_MEMORY_TOP]
+        if not grown:
+            await ctx.send('```No allocation site grew```')
+            return
+        lines = [f'{stat.size_diff / 1024:+10.1f} KiB {stat.count_diff:+8} blocks  {stat.traceback[0]}'
+                 for stat in grown]
+        await ctx.send('```' + _truncate('\n'.join(lines)) + '```')
+
     # @meta.command(brief='Show Superuser')
     # async def superuser(self, ctx):
     #     """Show Super User Details"""
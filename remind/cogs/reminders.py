@@ -8,9 +8,10 @@ import datetime as dt
 from pathlib import Path
 import re
 import copy
+import functools
+import os
 
-from collections import defaultdict
-from recordtype import recordtype
+from collections import defaultdict, OrderedDict
 from datetime import datetime
 
 import discord
@@ -23,6 +24,16 @@ from remind import constants
 from remind.util import clist_api as clist
 from remind.util.website_schema import WebsitePatterns
 from remind.util import website_schema
+from remind.util.role_pool import RolePool, FINALCALL_ROLE_PREFIX
+from remind.util.dm_queue import DMQueue
+from remind.util import leader
+from remind.util import metrics
+from remind.util.lateness import tracker as lateness_tracker
+from remind.util import outbox as outbox_module
+from remind.util import tiers
+from remind.util import ical
+from remind.util import http_server
+from remind.util.personal import PersonalSubscriptions, PersonalDispatcher
 
 
 class RemindersCogError(commands.CommandError):
@@ -32,38 +43,141 @@ class RemindersCogError(commands.CommandError):
 _CONTESTS_PER_PAGE = 5
 _CONTEST_PAGINATE_WAIT_TIME = 5 * 60
 _FINISHED_CONTESTS_LIMIT = 5
+_LISTING_CACHE_SIZE = 1000
+_REMINDER_MESSAGE_INDEX_SIZE = 10000
 _CONTEST_REFRESH_PERIOD = 10 * 60  # seconds
 _GUILD_SETTINGS_BACKUP_PERIOD = 6 * 60 * 60  # seconds
-
-GuildSettings = recordtype(
-    'GuildSettings', [
-        ('remind_channel_id_div1', None),
-        ('remind_role_id_div1', None),
-        ('remind_before_div1', None),
-        ('finalcall_channel_id_div1', None),
-        ('finalcall_before_div1', None),
-        ('subscribed_websites_div1', set()),
-
-        ('remind_channel_id_all', None),
-        ('remind_role_id_all', None),
-        ('remind_before_all', None),
-        ('finalcall_channel_id_all', None),
-        ('finalcall_before_all', None),
-        ('subscribed_websites_all', set())
-    ]
-)
+_FINALCALL_ROLE_SWEEP_PERIOD = 60 * 60  # seconds
+_SCHEDULE_SNAPSHOT_MAX_AGE = 24 * 60 * 60  # seconds
+# Bumped whenever pickled `Round`s gain or lose attributes, older snapshots are then ignored.
+# Snapshots also record the tiers, whose order `Round.tier_bits` follows.
+_SCHEDULE_SNAPSHOT_FORMAT = 3
+_PERSONAL_SUBSCRIPTION_LIMIT = 20  # per member
+_FEED_CACHE_SIZE = 1000
+_FEED_PATH = re.compile(r'/ical/(\d+)/(\w+)\.ics')
+_REACTION_EMOJI = "✅"
+# Title and empty listing message of each contest state, formatted with the tier label.
+_LISTING_TEXTS = {
+    'future': ('Future {}contests', 'No future {}contests scheduled'),
+    'active': ('Active {}contests', 'No {}contests currently active'),
+    'finished': ('Recently finished {}contests', 'No finished contests found'),
+}
+
+_UPDATE_SECONDS = metrics.histogram('remind_update_seconds', 'Duration of contest refreshes')
+_RESCHEDULE_SECONDS = metrics.histogram('remind_reschedule_seconds', 'Duration of rescheduling all guilds')
+_SERIALIZE_SECONDS = metrics.histogram('remind_serialize_seconds', 'Duration of guild map serialization')
+_SERIALIZE_BYTES = metrics.bytes_histogram('remind_serialize_bytes', 'Size of the serialized guild map')
+_REACTION_SECONDS = metrics.histogram('remind_reaction_handler_seconds', 'Latency of reminder reaction handling')
+
+class TierSettings:
+    """Reminder settings of a guild for one tier, website subscriptions are a bitmask
+    over `website_schema.website_bits`."""
+    __slots__ = _fields = (
+        'remind_channel_id',
+        'remind_role_id',
+        'remind_before',
+        'finalcall_channel_id',
+        'finalcall_before',
+        'subscribed_websites',
+    )
+
+    def __init__(self, **fields):
+        for name in self._fields:
+            setattr(self, name, fields.get(name, 0 if name == 'subscribed_websites' else None))
+        if not isinstance(self.subscribed_websites, int):
+            # Sets of websites from before subscriptions were bitmasks.
+            self.subscribed_websites = website_schema.websites_mask(self.subscribed_websites or ())
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self._fields)
+
+    def __setstate__(self, state):
+        self.__init__(**dict(zip(self._fields, state)))
+
+
+class GuildSettings:
+    """Reminder settings of a guild, a `TierSettings` per registered tier."""
+    __slots__ = ('tiers',)
+    # Tiers laid out one after the other in the flat state tuples of older pickles,
+    # recordtype ones included.
+    _LEGACY_TIERS = ('div1', 'all')
+
+    def __init__(self, tier_settings=None):
+        self.tiers = {tier.name: TierSettings() for tier in tiers.TIERS}
+        self.tiers.update(tier_settings or {})
+
+    def __getitem__(self, tier_name):
+        return self.tiers[tier_name]
+
+    def __getstate__(self):
+        return self.tiers
+
+    def __setstate__(self, state):
+        if isinstance(state, tuple):
+            size = len(TierSettings._fields)
+            state = {tier_name: TierSettings(**dict(zip(TierSettings._fields, state[index * size:(index + 1) * size])))
+                     for index, tier_name in enumerate(self._LEGACY_TIERS)}
+        self.__init__(state)
 
 
 class RemindRequest:
-    def __init__(self, channel, role, contest: Round, before_secs, send_time):
+    def __init__(self, channel, role, contest: Round, before_secs, send_time, tier):
         self.channel = channel
         self.role = role
         self.contest = contest
         self.before_secs = before_secs
         self.send_time = send_time
+        self.tier = tier
+
+    @property
+    def key(self):
+        return outbox_module.reminder_key(self.channel.guild.id, self.tier, self.contest.id, self.before_secs,
+                                          self.send_time)
+
+
+class ReminderMessage:
+    """What a posted reminder message is about, along with its number of ✅ reactors
+    kept up to date from gateway events."""
+
+    def __init__(self, *, guild_id, tier, contest_id, link, name, start_time, reactors=0):
+        self.guild_id = guild_id
+        self.tier = tier
+        self.contest_id = contest_id
+        self.link = link
+        self.name = name
+        # Epoch seconds.
+        self.start_time = start_time
+        self.reactors = reactors
+
+
+class ReminderMessageIndex:
+    """Bounded map from reminder message id to `ReminderMessage`.
+
+    Messages posted before a restart are missing and have to be fetched once.
+    """
+
+    def __init__(self, max_size=_REMINDER_MESSAGE_INDEX_SIZE):
+        self.max_size = max_size
+        self.messages = OrderedDict()
+
+    def get(self, message_id):
+        return self.messages.get(message_id)
+
+    def add(self, message_id, message):
+        self.messages[message_id] = message
+        if len(self.messages) > self.max_size:
+            self.messages.popitem(last=False)
+        return message
+
+    def prune(self, before_time):
+        """Forgets messages of contests which started before the given epoch."""
+        self.messages = OrderedDict((message_id, message) for message_id, message in self.messages.items()
+                                    if message.start_time >= before_time)
 
 
 class FinalCallRequest:
+    """Legacy final call state, kept so that old guild map pickles still load."""
+
     def __init__(self, *, embed, role_id, msg_id=None):
         self.role_id = role_id
         self.msg_id = msg_id
@@ -71,16 +185,38 @@ class FinalCallRequest:
         self.embed_fields = [(field.name, field.value) for field in embed.fields]
 
 
+class FinalCallRecord:
+    """A pending final call of a contest in a guild."""
+
+    def __init__(self, *, contest_id, link, name, start_time, role_id, tier, msg_id=None):
+        self.contest_id = contest_id
+        self.link = link
+        self.name = name
+        # Epoch seconds.
+        self.start_time = start_time
+        self.role_id = role_id
+        self.msg_id = msg_id
+        # Name of the tier.
+        self.tier = tier
+
+    @classmethod
+    def from_legacy(cls, request, tier):
+        name, value = request.embed_fields[0]
+        link, start_time = _get_values_from_field_value(value)
+        return cls(contest_id=None, link=link, name=name, start_time=start_time,
+                   role_id=request.role_id, tier=tier, msg_id=request.msg_id)
+
+
 def get_default_guild_settings():
-    settings = GuildSettings()
-    settings.subscribed_websites_div1 = set()
-    settings.subscribed_websites_all = set()
-    return settings
+    return GuildSettings()
+
+
+def _contest_start_epoch(contest):
+    return int(contest.start_time.replace(tzinfo=dt.timezone.utc).timestamp())
 
 
 def _contest_start_time_format(contest):
-    seconds = int(contest.start_time.replace(tzinfo=dt.timezone.utc).timestamp())
-    return f'<t:{seconds}:F>'
+    return f'<t:{_contest_start_epoch(contest)}:F>'
 
 
 def _contest_duration_format(contest):
@@ -96,6 +232,12 @@ def _get_formatted_contest_desc(start, duration, url):
     return f'{start}\nDuration:{em}{duration}{em}|{em}[link]({url})'
 
 
+def _get_values_from_field_value(value):
+    link = re.findall(r']\((http.+)\)', value)[0]
+    start_time = int(re.findall(r'<t:(\d+):[A-za-z]>', value)[0])
+    return link, start_time
+
+
 def _get_contest_website_prefix(contest):
     website_details = website_schema.schema[contest.website]
     return website_details.prefix
@@ -105,38 +247,134 @@ def _get_display_name(website, name):
     return (website + " || " + name) if website.lower() not in name.lower() else name
 
 
+def _format_before(before_secs):
+    def make(value, label):
+        tmp = f'{value} {label}'
+        return tmp if value == 1 else tmp + 's'
+
+    values = discord_common.time_format(before_secs)
+    labels = 'day hr min sec'.split()
+    return ' '.join(make(value, label) for label, value in zip(labels, values) if value > 0)
+
+
+class ContestRenderCache:
+    """Holds the pre-rendered embed text of contests so that it is built once
+    and shared by every guild, list page and reminder.
+
+    Entries are keyed on (contest id, contest version[, before_secs]), so a contest
+    that changes upstream is rendered afresh and stale entries are dropped by `retain`.
+    """
+
+    def __init__(self):
+        self._fields = {}
+        self._reminders = {}
+        self._events = {}
+
+    def field(self, contest):
+        """Returns the (website, display name, value) field tuple for the contest."""
+        key = (contest.id, contest.version)
+        field = self._fields.get(key)
+        if field is None:
+            start = _contest_start_time_format(contest)
+            duration = _contest_duration_format(contest)
+            value = _get_formatted_contest_desc(start, duration, contest.url)
+            website = _get_contest_website_prefix(contest)
+            field = (website, _get_display_name(website, contest.name), value)
+            self._fields[key] = field
+        return field
+
+    def reminder(self, contest, before_secs):
+        """Returns the (description, field) pair of a reminder sent before_secs before the contest."""
+        key = (contest.id, contest.version, before_secs)
+        rendered = self._reminders.get(key)
+        if rendered is None:
+            rendered = (f'About to start in {_format_before(before_secs)}!', self.field(contest))
+            self._reminders[key] = rendered
+        return rendered
+
+    def event(self, contest):
+        """Returns the iCalendar VEVENT of the contest."""
+        key = (contest.id, contest.version)
+        event = self._events.get(key)
+        if event is None:
+            _, name, _ = self.field(contest)
+            event = ical.event(uid=f'{contest.id}@{contest.website}', start=contest.start_time,
+                               end=contest.start_time + contest.duration, summary=name, url=contest.url)
+            self._events[key] = event
+        return event
+
+    def retain(self, contests):
+        """Drops the entries of contests which are gone or have changed."""
+        live = {(contest.id, contest.version) for contest in contests}
+        self._fields = {key: field for key, field in self._fields.items() if key in live}
+        self._reminders = {key: rendered for key, rendered in self._reminders.items() if key[:2] in live}
+        self._events = {key: event for key, event in self._events.items() if key in live}
+
+
+_render_cache = ContestRenderCache()
+
+
 def _get_embed_fields_from_contests(contests):
-    fields = []
-    for contest in contests:
-        start = _contest_start_time_format(contest)
-        duration = _contest_duration_format(contest)
-        value = _get_formatted_contest_desc(start, duration, contest.url)
-        website = _get_contest_website_prefix(contest)
-        fields.append((website, contest.name, value))
-    return fields
+    return [_render_cache.field(contest) for contest in contests]
+
 
+async def _find_sent_reminder(request):
+    """Looks for a reminder which was sent right before a crash but never journaled as delivered."""
+    after = dt.datetime.fromtimestamp(request.send_time - 60).replace(tzinfo=dt.timezone.utc)
+    me = request.channel.guild.me
+    async for message in request.channel.history(limit=50, after=after):
+        if (message.author == me and message.embeds and message.embeds[0].fields
+                and request.contest.url in message.embeds[0].fields[0].value):
+            return message
+    return None
 
-async def _send_reminder_at(request):
+
+async def _send_reminder_at(request, message_index, outbox, *, replay=False):
+    key = request.key
     delay = request.send_time - dt.datetime.utcnow().timestamp()
-    if delay <= 0:
+    if outbox.state(key) == outbox_module.DELIVERED or (delay <= 0 and not replay):
         return
 
     await asyncio.sleep(delay)
-    values = discord_common.time_format(request.before_secs)
-
-    def make(value, label):
-        tmp = f'{value} {label}'
-        return tmp if value == 1 else tmp + 's'
-
-    labels = 'day hr min sec'.split()
-    before_str = ' '.join(make(value, label) for label, value in zip(labels, values) if value > 0)
-    desc = f'About to start in {before_str}!'
+    if not leader.is_leader() or outbox.state(key) == outbox_module.DELIVERED:
+        return
+    if replay and outbox.state(key) == outbox_module.DISPATCHING:
+        try:
+            if await _find_sent_reminder(request) is not None:
+                outbox.mark_delivered(key, request.send_time, dt.datetime.utcnow().timestamp())
+                return
+        except discord.HTTPException:
+            pass
+    dispatched = dt.datetime.utcnow().timestamp()
+    outbox.mark_dispatching(key, request.send_time, dispatched)
+    desc, (website, name, value) = _render_cache.reminder(request.contest, request.before_secs)
     embed = discord_common.color_embed(description=desc)
     if request.contest.is_rare():
         embed.set_footer(text=f"Its once in a while contest, you wouldn't wanna miss 👀")
-    for website, name, value in _get_embed_fields_from_contests([request.contest]):
-        embed.add_field(name=_get_display_name(website, name), value=value, inline=False)
-    await request.channel.send(request.role.mention + f' Its {website} time!', embed=embed)
+    embed.add_field(name=name, value=value, inline=False)
+    message = await request.channel.send(request.role.mention + f' Its {website} time!', embed=embed)
+    acknowledged = dt.datetime.utcnow().timestamp()
+    outbox.mark_delivered(key, request.send_time, acknowledged)
+    lateness_tracker.record(request.channel.guild.id, request.tier, 'reminder',
+                            request.send_time, dispatched, acknowledged)
+    contest = request.contest
+    message_index.add(message.id, ReminderMessage(guild_id=request.channel.guild.id, tier=request.tier,
+                                                  contest_id=contest.id, link=contest.url, name=name,
+                                                  start_time=_contest_start_epoch(contest)))
+    await message.add_reaction(_REACTION_EMOJI)
+
+
+def _load_contests():
+    """Refreshes the contest db when stale and parses it. This blocks, so the bot runs it in an executor."""
+    clist.cache(forced=False)
+    db_file = Path(constants.CONTESTS_DB_FILE_PATH)
+    try:
+        with db_file.open() as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        # Cluster workers and standbys wait for the process querying clist to write it.
+        return None
+    return [Round(contest) for contest in data['objects']]
 
 
 def filter_contests(filters, contests):
@@ -156,311 +394,573 @@ def filter_contests(filters, contests):
     return filtered_contests
 
 
+class ListingCache:
+    """LRU cache of contest listings keyed on (guild, tier, state, filters).
+
+    Every entry is tagged with the contest data generation and the guild's settings
+    version it was built from, and is only served while both still match.
+    """
+
+    def __init__(self, max_size=_LISTING_CACHE_SIZE):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, tag):
+        entry = self.entries.get(key)
+        if entry is None or entry[0] != tag:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key, tag, listing):
+        self.entries[key] = (tag, listing)
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def _count_pending(task_map):
+    """Counts the tasks not done yet in a guild id to tasks map, final call maps hold (send_time, task) pairs."""
+    pending = 0
+    for tasks in task_map.values():
+        for task in (tasks.values() if isinstance(tasks, dict) else tasks):
+            if isinstance(task, tuple):
+                task = task[1]
+            pending += not task.done()
+    return pending
+
+
 def create_tuple_defaultdict():
+    # Default factory of legacy final call maps, kept so that old guild map pickles still load.
     return defaultdict(FinalCallRequest)
 
 
+def _migrate_finalcall_map(finalcall_map, tier):
+    migrated = defaultdict(dict)
+    for guild_id, records in finalcall_map.items():
+        for link, record in records.items():
+            if isinstance(record, FinalCallRequest):
+                record = FinalCallRecord.from_legacy(record, tier)
+            migrated[guild_id][link] = record
+    return migrated
+
+
 class Reminders(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
-        self.future_contests_div1 = None
-        self.contest_cache_div1 = None
-        self.active_contests_div1 = None
-        self.finished_contests_div1 = None
-        self.start_time_map_div1 = defaultdict(list)
-        self.task_map_div1 = defaultdict(list)
-
-        self.future_contests_all = None
-        self.contest_cache_all = None
-        self.active_contests_all = None
-        self.finished_contests_all = None
-        self.start_time_map_all = defaultdict(list)
-        self.task_map_all = defaultdict(list)
+        # Contests of any tier.
+        self.contest_cache = None
+        # Per tier name, maps 'future', 'active' and 'finished' to the tier's contests.
+        self.contest_lists = {tier.name: {} for tier in tiers.TIERS}
+        # Maps start time to the future contests of any tier starting then.
+        self.start_time_map = defaultdict(list)
+        # Per tier name, maps guild_id to reminder tasks.
+        self.task_maps = {tier.name: defaultdict(list) for tier in tiers.TIERS}
 
         # Maps guild_id to `GuildSettings`
         self.guild_map = defaultdict(get_default_guild_settings)
+        # Bumped whenever the contest lists or a guild's settings change.
+        self.contest_generation = 0
+        self.settings_version = defaultdict(int)
+        # Guilds whose settings a command changed, persisted and rescheduled once it finishes.
+        self.changed_guilds = set()
+        # Bumped only when a future or active contest appears, changes or goes away.
+        self.feed_generation = 0
+        self.feed_timeline = frozenset()
+        self.listing_cache = ListingCache()
+        # Holds the rendered iCalendar feeds with their ETag, tagged like contest listings.
+        self.feed_cache = ListingCache(max_size=_FEED_CACHE_SIZE)
         self.last_guild_backup_time = -1
-        self.reaction_emoji = "✅"
+        self.reaction_emoji = _REACTION_EMOJI
+        # Maps the id of every reminder channel to the name of its tier.
+        self.reminder_channel_ids = {}
         self.nope_emoji = 973583086174498847
 
-        self.finalcall_map_div1 = defaultdict(create_tuple_defaultdict)
-        self.finaltasks_div1 = defaultdict(lambda: dict())
-        self.finalcall_map_all = defaultdict(create_tuple_defaultdict)
-        self.finaltasks_all = defaultdict(lambda: dict())
+        # Per tier name, maps guild_id to contest link to `FinalCallRecord`
+        self.finalcall_maps = {tier.name: defaultdict(dict) for tier in tiers.TIERS}
+        # Per tier name, maps guild_id to contest link to (send_time, task)
+        self.finaltasks = {tier.name: defaultdict(dict) for tier in tiers.TIERS}
+        self.contests_by_id = {}
+        self.message_index = ReminderMessageIndex()
+        self.role_pool = RolePool()
+        self.dm_queue = DMQueue(on_failure=self.victim_card)
+        self.revalidated = False
+        self.outbox = outbox_module.Outbox(constants.REMINDER_OUTBOX_PATH)
+        self.outbox_replayed = False
+        self.personal = PersonalSubscriptions(constants.PERSONAL_SUBSCRIPTIONS_PATH)
+        self.personal_dispatcher = PersonalDispatcher(self.bot, self.personal, self._make_personal_embed)
 
         self.member_converter = commands.MemberConverter()
         self.role_converter = commands.RoleConverter()
 
         self.logger = logging.getLogger(self.__class__.__name__)
 
+        if constants.ICAL_PORT is not None:
+            http_server.add_route(constants.ICAL_PORT, '/ical/', self._serve_ical_feed)
+
+        metrics.gauge('remind_pending_reminders', 'Reminder tasks waiting to be sent',
+                      lambda: {(('tier', tier_name),): _count_pending(task_map)
+                               for tier_name, task_map in self.task_maps.items()})
+        metrics.gauge('remind_pending_finalcalls', 'Final calls waiting to be sent',
+                      lambda: {(('tier', tier_name),): _count_pending(finaltasks)
+                               for tier_name, finaltasks in self.finaltasks.items()})
+        metrics.gauge('remind_dm_queue_depth', 'Members with direct messages waiting to be sent',
+                      lambda: len(self.dm_queue))
+        metrics.gauge('remind_personal_dm_queue_depth', 'Personal reminders waiting to be sent',
+                      lambda: len(self.personal_dispatcher))
+        metrics.gauge('remind_live_paginators', 'Paginators still accepting navigation',
+                      lambda: paginator.live_paginator_count(self.bot))
+        metrics.gauge('remind_listing_cache_hits', 'Contest listings served from the cache',
+                      lambda: self.listing_cache.hits)
+        metrics.gauge('remind_listing_cache_misses', 'Contest listings built afresh',
+                      lambda: self.listing_cache.misses)
+
     @commands.Cog.listener()
     @discord_common.once
     async def on_ready(self):
+        self._load_guild_map()
+        self.outbox.load()
+        self.personal.load()
+        leader.add_promotion_listener(self._on_promotion)
+        if self._restore_schedule_snapshot():
+            self.logger.info(f'Reminders armed from the schedule snapshot '
+                             f'{time.time() - constants.PROCESS_START_TIME:.2f}s after launch')
+            self._replay_outbox()
+        asyncio.create_task(self._update_task())
+        asyncio.create_task(self._finalcall_role_sweep_task())
+        self.dm_queue.start()
+        self.personal_dispatcher.start()
+
+    def _load_guild_map(self):
         guild_map_path = Path(constants.GUILD_SETTINGS_MAP_PATH)
+        if not guild_map_path.exists():
+            guild_map_path = Path(constants.SHARED_GUILD_SETTINGS_MAP_PATH)
         try:
             with guild_map_path.open('rb') as guild_map_file:
                 data = pickle.load(guild_map_file)
                 guild_map = data["guild_map"]
-                self.finalcall_map_div1 = data["finalcall_map_div1"]
-                self.finalcall_map_all = data["finalcall_map_all"]
-                for guild_id, guild_settings in guild_map.items():
-                    self.guild_map[guild_id] = GuildSettings(**{key: value
-                                                                for key, value
-                                                                in guild_settings._asdict().items()
-                                                                if key in GuildSettings._fields})
+                finalcall_maps = data.get("finalcall_maps")
+                if finalcall_maps is None:
+                    finalcall_maps = {tier_name: data[f"finalcall_map_{tier_name}"]
+                                      for tier_name in GuildSettings._LEGACY_TIERS}
+                self.finalcall_maps = {tier.name: _migrate_finalcall_map(finalcall_maps.get(tier.name, {}), tier.name)
+                                       for tier in tiers.TIERS}
+                self.guild_map.clear()
+                # Settings pickled by recordtype are migrated by `GuildSettings.__setstate__`.
+                self.guild_map.update(guild_map)
         except BaseException:
             pass
-        asyncio.create_task(self._update_task())
+        self.listing_cache.clear()
+        self.feed_cache.clear()
+        self._refresh_reminder_channels()
+
+    def _reload_guild_map(self):
+        """Picks up the state the leader saved, dropping the final call tasks of the old records."""
+        for finaltasks in self.finaltasks.values():
+            for tasks in finaltasks.values():
+                for _, task in tasks.values():
+                    task.cancel()
+            finaltasks.clear()
+        self._load_guild_map()
+
+    async def _on_promotion(self):
+        self._reload_guild_map()
+        self.outbox.load()
+        self.personal.load()
+        self._reschedule_all_tasks()
+        self._replay_outbox()
 
     async def cog_after_invoke(self, ctx):
+        # Listings and other read only commands leave the guild map and schedule alone.
+        if ctx.guild is None or ctx.guild.id not in self.changed_guilds:
+            return
+        self.changed_guilds.discard(ctx.guild.id)
         self._serialize_guild_map()
         self._backup_serialize_guild_map()
         self._reschedule_reminder_tasks(ctx.guild.id)
         self._reschedule_finalcall_tasks(ctx.guild.id)
 
     async def _update_task(self):
-        self.logger.info(f'Invoking Scheduled Reminder Updates')
-        self._generate_contest_cache()
-        contest_cache_div1 = self.contest_cache_div1
-        contest_cache_all = self.contest_cache_all
-        current_time = dt.datetime.utcnow()
-
-        self.future_contests_div1 = [
-            contest for contest in contest_cache_div1
-            if contest.start_time > current_time
-        ]
-        self.finished_contests_div1 = [
-            contest for contest in contest_cache_div1
-            if contest.start_time + contest.duration < current_time
-        ]
-        self.active_contests_div1 = [
-            contest for contest in contest_cache_div1
-            if contest.start_time <= current_time <= contest.start_time + contest.duration
-        ]
-
-        self.future_contests_all = [
-            contest for contest in contest_cache_all
-            if contest.start_time > current_time
-        ]
-        self.finished_contests_all = [
-            contest for contest in contest_cache_all
-            if contest.start_time + contest.duration < current_time
-        ]
-        self.active_contests_all = [
-            contest for contest in contest_cache_all
-            if contest.start_time <= current_time <= contest.start_time + contest.duration
-        ]
-
-        self.active_contests_div1.sort(key=lambda contest: contest.start_time)
-        self.active_contests_all.sort(key=lambda contest: contest.start_time)
-        self.finished_contests_div1.sort(key=lambda contest: contest.start_time + contest.duration, reverse=True)
-        self.finished_contests_all.sort(key=lambda contest: contest.start_time + contest.duration, reverse=True)
-        self.future_contests_div1.sort(key=lambda contest: contest.start_time)
-        self.future_contests_all.sort(key=lambda contest: contest.start_time)
-        # Keep most recent _FINISHED_LIMIT
-        self.finished_contests_div1 = self.finished_contests_div1[:_FINISHED_CONTESTS_LIMIT]
-        self.finished_contests_all = self.finished_contests_all[:_FINISHED_CONTESTS_LIMIT]
-        self.start_time_map_div1.clear()
-        for contest in self.future_contests_div1:
-            self.start_time_map_div1[time.mktime(contest.start_time.timetuple())].append(contest)
-        self.start_time_map_all.clear()
-        for contest in self.future_contests_all:
-            self.start_time_map_all[time.mktime(contest.start_time.timetuple())].append(contest)
-        self._reschedule_all_tasks()
+        try:
+            await self._update_contests()
+        except Exception as e:
+            # Keep refreshing, the next tick may well succeed.
+            self.logger.exception(f'Scheduled reminder update failed: {e!r}')
         await asyncio.sleep(_CONTEST_REFRESH_PERIOD)
         asyncio.create_task(self._update_task())
 
-    def _generate_contest_cache(self):
-        clist.cache(forced=False)
-        db_file = Path(constants.CONTESTS_DB_FILE_PATH)
-        with db_file.open() as f:
-            data = json.load(f)
-        contests = [Round(contest) for contest in data['objects']]
-        self.contest_cache_div1 = [contest for contest in contests if contest.is_desired_for_div1(website_schema.schema)]
-        self.contest_cache_all = [contest for contest in contests if contest.is_desired_for_all(website_schema.schema)]
-
-    def get_guild_contests(self, contests, guild_id):
-        settings = self.guild_map[guild_id]
+    async def _update_contests(self):
+        contests = await asyncio.get_running_loop().run_in_executor(None, _load_contests)
+        if contests is None:
+            self.logger.info('No contest db yet, retrying on the next refresh')
+            return
+        with _UPDATE_SECONDS.time():
+            self._refresh_contests(contests)
+        if not self.outbox_replayed:
+            self._replay_outbox()
+        if not self.revalidated:
+            self.revalidated = True
+            self.logger.info(f'Schedule validated against clist data '
+                             f'{time.time() - constants.PROCESS_START_TIME:.2f}s after launch')
+        self.save_schedule_snapshot()
+
+    def save_schedule_snapshot(self):
+        """Saves the parsed contest timeline so that the next start can arm reminders right away."""
+        if not leader.is_leader() or not self.contests_by_id:
+            return
+        data = {'format': _SCHEDULE_SNAPSHOT_FORMAT, 'saved_at': time.time(),
+                'tiers': [tier.name for tier in tiers.TIERS], 'contests': list(self.contests_by_id.values())}
+        out_path = Path(constants.SCHEDULE_SNAPSHOT_PATH)
+        tmp_path = out_path.with_suffix('.tmp')
+        with tmp_path.open(mode='wb') as out_file:
+            pickle.dump(data, out_file)
+        os.replace(tmp_path, out_path)
 
-        desired_contests_for_div1 = []
-        desired_contests_for_all = []
+    def _restore_schedule_snapshot(self):
+        try:
+            with Path(constants.SCHEDULE_SNAPSHOT_PATH).open('rb') as snapshot_file:
+                data = pickle.load(snapshot_file)
+        except BaseException:
+            return False
+        if (data.get('format') != _SCHEDULE_SNAPSHOT_FORMAT
+                or data.get('tiers') != [tier.name for tier in tiers.TIERS]
+                or time.time() - data['saved_at'] > _SCHEDULE_SNAPSHOT_MAX_AGE):
+            return False
+        self._refresh_contests(data['contests'])
+        return True
+
+    def _refresh_contests(self, contests=None):
+        self.logger.info(f'Invoking Scheduled Reminder Updates')
+        if not leader.is_leader():
+            # Keep the standby's schedule warm with the leader's latest state.
+            self._reload_guild_map()
+            self.personal.load()
+        self._generate_contest_cache(contests)
+        current_time = dt.datetime.utcnow()
 
-        for contest in contests:
-            if contest.is_desired_for_div1(settings.subscribed_websites_div1):
-                desired_contests_for_div1.append(contest)
-            if contest.is_desired_for_all(settings.subscribed_websites_all):
-                desired_contests_for_all.append(contest)
+        # Classify every contest once, whatever the number of tiers.
+        future, active, finished = [], [], []
+        for contest in self.contest_cache:
+            if contest.start_time > current_time:
+                future.append(contest)
+            elif contest.start_time + contest.duration < current_time:
+                finished.append(contest)
+            else:
+                active.append(contest)
+        future.sort(key=lambda contest: contest.start_time)
+        active.sort(key=lambda contest: contest.start_time)
+        finished.sort(key=lambda contest: contest.start_time + contest.duration, reverse=True)
+
+        every_website = website_schema.ALL_WEBSITES_MASK
+        for tier in tiers.TIERS:
+            self.contest_lists[tier.name] = {
+                'future': [contest for contest in future if contest.is_desired(tier, every_website)],
+                'active': [contest for contest in active if contest.is_desired(tier, every_website)],
+                # Keep most recent _FINISHED_LIMIT
+                'finished': [contest for contest in finished
+                             if contest.is_desired(tier, every_website)][:_FINISHED_CONTESTS_LIMIT],
+            }
+        timeline = frozenset((contest.id, contest.version) for contest in future + active)
+        if timeline != self.feed_timeline:
+            self.feed_timeline = timeline
+            self.feed_generation += 1
+        self.start_time_map.clear()
+        for contest in future:
+            self.start_time_map[time.mktime(contest.start_time.timetuple())].append(contest)
+        self.contest_generation += 1
+        self.message_index.prune(dt.datetime.utcnow().timestamp())
+        self.logger.info(f'Contest listing cache hit rate: {self.listing_cache.hit_rate:.1%} '
+                         f'({self.listing_cache.hits} hits, {self.listing_cache.misses} misses)')
+        self.listing_cache.clear()
+        self._reschedule_all_tasks()
+        self._schedule_personal_reminders()
 
-        return desired_contests_for_div1, desired_contests_for_all
+    async def _finalcall_role_sweep_task(self):
+        await asyncio.sleep(_FINALCALL_ROLE_SWEEP_PERIOD)
+        if leader.is_leader():
+            await self._sweep_finalcall_roles()
+        asyncio.create_task(self._finalcall_role_sweep_task())
 
-    def _reschedule_all_tasks(self):
+    async def _sweep_finalcall_roles(self):
         for guild in self.bot.guilds:
-            self._reschedule_reminder_tasks(guild.id)
-            self._reschedule_finalcall_tasks(guild.id)
-
-    def _reschedule_reminder_tasks(self, guild_id):
-        for task in self.task_map_div1[guild_id]:
-            task.cancel()
-        for task in self.task_map_all[guild_id]:
-            task.cancel()
-        self.task_map_div1[guild_id].clear()
-        self.task_map_all[guild_id].clear()
+            in_use_role_ids = {record.role_id
+                               for finalcall_map in self.finalcall_maps.values()
+                               for record in finalcall_map[guild.id].values()}
+            reclaimed = await self.role_pool.sweep(guild, in_use_role_ids)
+            if reclaimed:
+                self.logger.info(f'Reclaimed {reclaimed} orphaned final call roles in guild "{guild}"')
+
+    def _generate_contest_cache(self, contests=None):
+        if contests is None:
+            contests = _load_contests() or []
+        _render_cache.retain(contests)
+        self.contests_by_id = {contest.id: contest for contest in contests}
+        self.contest_cache = [contest for contest in contests if any(contest.tier_bits)]
 
-        self.logger.info(f'Tasks for guild "{self.bot.get_guild(guild_id)}" cleared')
+    def get_guild_contests(self, contests, guild_id, tier):
+        subscribed_websites = self.guild_map[guild_id][tier.name].subscribed_websites
+        return [contest for contest in contests if contest.is_desired(tier, subscribed_websites)]
 
+    def _reschedule_all_tasks(self):
+        with _RESCHEDULE_SECONDS.time():
+            for guild in self.bot.guilds:
+                self._reschedule_reminder_tasks(guild.id)
+                self._reschedule_finalcall_tasks(guild.id)
+        # Per guild lines are logged at debug level, this sums them up.
+        reminders = ', '.join(f'{_count_pending(self.task_maps[tier.name])} {tier.name}' for tier in tiers.TIERS)
+        finalcalls = ', '.join(f'{_count_pending(self.finaltasks[tier.name])} {tier.name}' for tier in tiers.TIERS)
+        self.logger.info(f'Reminder tasks ({reminders}) and final calls ({finalcalls}) scheduled '
+                         f'across {len(self.bot.guilds)} guilds')
+
+    def _schedule_personal_reminders(self):
+        # Any contest may be subscribed to personally, so they come from the widest tier.
+        self.personal_dispatcher.schedule(self.contest_lists[tiers.ALL.name].get('future', []),
+                                          _contest_start_epoch)
+
+    def _reminder_targets(self, guild_id):
+        """(tier, channel, role, before secs, subscribed websites) of the tiers the guild is reminded of."""
         settings = self.guild_map[guild_id]
-
-        if self.start_time_map_div1 and not settings.remind_role_id_div1 is None:
-            guild = self.bot.get_guild(guild_id)
-
-            channel_div1 = guild.get_channel(settings.remind_channel_id_div1)
-            role_div1 =  guild.get_role(settings.remind_role_id_div1)
-
-            for start_time, contests in self.start_time_map_div1.items():
-                contests_for_div1 = self.get_guild_contests(contests, guild_id)[0]
-
-                if not contests_for_div1:
+        guild = self.bot.get_guild(guild_id)
+        targets = []
+        for tier in tiers.TIERS:
+            tier_settings = settings[tier.name]
+            if tier_settings.remind_role_id is None:
+                continue
+            targets.append((tier, guild.get_channel(tier_settings.remind_channel_id),
+                            guild.get_role(tier_settings.remind_role_id),
+                            [60 * before_mins for before_mins in tier_settings.remind_before],
+                            tier_settings.subscribed_websites))
+        return targets
+
+    def _replay_outbox(self):
+        """Sends the reminders which fell due within the grace period but were never delivered,
+        e.g. while the bot was down. They are worked out from the current settings and contests,
+        so reminders dropped by unsubscribing, reconfiguring or clearing are not replayed."""
+        self.outbox_replayed = True
+        now = dt.datetime.utcnow().timestamp()
+        oldest = now - outbox_module.GRACE_PERIOD
+        guild_targets = [(guild, self._reminder_targets(guild.id)) for guild in self.bot.guilds]
+        longest = max((before_secs for _, targets in guild_targets for *_, befores, _ in targets
+                       for before_secs in befores), default=0)
+        # Only contests starting soon or a little while ago can have a reminder in the window.
+        recent = [(time.mktime(contest.start_time.timetuple()), contest) for contest in self.contests_by_id.values()]
+        recent = [(start_time, contest) for start_time, contest in recent if oldest <= start_time <= now + longest]
+        replayed = 0
+        for guild, targets in guild_targets:
+            for tier, channel, role, befores, subscribed_websites in targets:
+                if channel is None or role is None:
                     continue
+                for start_time, contest in recent:
+                    if not contest.is_desired(tier, subscribed_websites):
+                        continue
+                    for before_secs in befores:
+                        if not oldest <= start_time - before_secs <= now:
+                            continue
+                        request = RemindRequest(channel, role, contest, before_secs,
+                                                start_time - before_secs, tier.name)
+                        if self.outbox.state(request.key) == outbox_module.DELIVERED:
+                            continue
+                        asyncio.create_task(_send_reminder_at(request, self.message_index, self.outbox,
+                                                              replay=True))
+                        replayed += 1
+        if replayed:
+            self.logger.info(f'Replaying {replayed} reminders missed while the bot was down')
 
-                website_seggregated_contests_for_div1 = dict()
-                for contest_for_div1 in contests_for_div1:
-                    website_seggregated_contests_for_div1[contest_for_div1.url] = contest_for_div1  # an url can uniquely identify a contest
+    def _reschedule_reminder_tasks(self, guild_id):
+        for task_map in self.task_maps.values():
+            for task in task_map[guild_id]:
+                task.cancel()
+            task_map[guild_id].clear()
 
-                for _, seg_contest in website_seggregated_contests_for_div1.items():
-                    for before_mins in settings.remind_before_div1:
-                        before_secs = 60 * before_mins
-                        request = RemindRequest(channel_div1, role_div1, seg_contest, before_secs, start_time - before_secs)
-                        task = asyncio.create_task(_send_reminder_at(request))
-                        self.task_map_div1[guild_id].append(task)
+        guild = self.bot.get_guild(guild_id)
+        self.logger.debug(f'Tasks for guild "{guild}" cleared')
 
-            self.logger.info(
-                f'{len(self.task_map_div1[guild_id])} div1 reminder tasks scheduled for guild "{self.bot.get_guild(guild_id)}"')
+        targets = self._reminder_targets(guild_id)
+        if not targets:
+            return
 
-        if self.start_time_map_all and not settings.remind_role_id_all is None:
-            guild = self.bot.get_guild(guild_id)
+        now = dt.datetime.utcnow().timestamp()
+        for start_time, contests in self.start_time_map.items():
+            for tier, channel, role, befores, subscribed_websites in targets:
+                # an url can uniquely identify a contest
+                website_seggregated_contests = {contest.url: contest for contest in contests
+                                                if contest.is_desired(tier, subscribed_websites)}
+                for seg_contest in website_seggregated_contests.values():
+                    for before_secs in befores:
+                        if start_time - before_secs <= now:
+                            # Past reminders are either delivered already or left to the outbox replay.
+                            continue
+                        request = RemindRequest(channel, role, seg_contest, before_secs,
+                                                start_time - before_secs, tier.name)
+                        task = asyncio.create_task(_send_reminder_at(request, self.message_index, self.outbox))
+                        self.task_maps[tier.name][guild_id].append(task)
+
+        for tier, *_ in targets:
+            self.logger.debug(f'{len(self.task_maps[tier.name][guild_id])} {tier.name} reminder tasks '
+                              f'scheduled for guild "{guild}"')
 
-            channel_all = guild.get_channel(settings.remind_channel_id_all)
-            role_all = guild.get_role(settings.remind_role_id_all)
+    def _reschedule_finalcall_tasks(self, guild_id):
+        """Schedules final calls whose send time changed, pending ones are left untouched."""
+        settings = self.guild_map[guild_id]
+        for tier in tiers.TIERS:
+            finalcall_map, finaltasks = self.finalcall_maps[tier.name], self.finaltasks[tier.name]
+            records = finalcall_map[guild_id]
+            if not records:
+                continue
 
-            for start_time, contests in self.start_time_map_all.items():
-                contests_for_all = self.get_guild_contests(contests, guild_id)[1]
+            guild = self.bot.get_guild(guild_id)
+            finalcall_before = settings[tier.name].finalcall_before
+            rescheduled = 0
+            for link, record in list(records.items()):
+                contest = self.contests_by_id.get(record.contest_id)
+                if contest is not None:
+                    record.start_time = _contest_start_epoch(contest)
+                send_time = record.start_time - finalcall_before * 60
+
+                scheduled = finaltasks[guild_id].get(link)
+                if scheduled is not None:
+                    scheduled_send_time, task = scheduled
+                    if scheduled_send_time == send_time and not task.done():
+                        continue
+                    task.cancel()
+                    del finaltasks[guild_id][link]
 
-                if not contests_for_all:
+                if guild.get_role(record.role_id) is None:
+                    del records[link]
                     continue
+                task = asyncio.create_task(self.send_finalcall_reminder(guild_id, record, send_time))
+                finaltasks[guild_id][link] = (send_time, task)
+                rescheduled += 1
 
-                website_seggregated_contests_for_all = dict()
-                for contest_for_all in contests_for_all:
-                    website_seggregated_contests_for_all[contest_for_all.url] = contest_for_all  # an url can uniquely identify a contest
-
-                for _, seg_contest in website_seggregated_contests_for_all.items():
-                    for before_mins in settings.remind_before_all:
-                        before_secs = 60 * before_mins
-                        request = RemindRequest(channel_all, role_all, seg_contest, before_secs, start_time - before_secs)
-                        task = asyncio.create_task(_send_reminder_at(request))
-                        self.task_map_all[guild_id].append(task)
-
-            self.logger.info(
-                f'{len(self.task_map_all[guild_id])} reminder tasks scheduled for guild "{self.bot.get_guild(guild_id)}"')
-
-    def _reschedule_finalcall_tasks(self, guild_id):
-        if self.finalcall_map_div1[guild_id]:
-            pending_reschedule_div1 = []
-            for link, data in self.finalcall_map_div1[guild_id].items():
-                try:
-                    pending_reschedule_div1.append(data)
-                    task = self.finaltasks_div1[guild_id][link]
-                    task.cancel()
-                except KeyError:
-                    pass
-
-            self.finalcall_map_div1[guild_id].clear()
-            for data in pending_reschedule_div1:
-                embed_desc, embed_fields = data.embed_desc, data.embed_fields
-                embed = discord_common.color_embed()
-                embed.description = embed_desc
-                for (name, value) in embed_fields:
-                    embed.add_field(name=name, value=value, inline=False)
-                link, start_time = self.get_values_from_embed(embed)
-                send_time = start_time - self.guild_map[guild_id].finalcall_before_div1 * 60
-
-                reaction_role = self.bot.get_guild(guild_id).get_role(data.role_id)
-                if reaction_role is not None:
-                    task = asyncio.create_task(
-                        self.send_finalcall_reminder(embed, guild_id, reaction_role, send_time, link, for_all = False))
-                    self.finalcall_map_div1[guild_id][link] = FinalCallRequest(role_id=reaction_role.id, embed=embed,
-                                                                          msg_id=data.msg_id)
-                    self.finaltasks_div1[guild_id][link] = task
-
-            self.logger.info(
-                f'{len(self.finalcall_map_div1[guild_id])} div1 final calls scheduled for guild "{self.bot.get_guild(guild_id)}"')
-
-        if self.finalcall_map_all[guild_id]:
-            pending_reschedule_all = []
-            for link, data in self.finalcall_map_all[guild_id].items():
-                try:
-                    pending_reschedule_all.append(data)
-                    task = self.finaltasks_all[guild_id][link]
-                    task.cancel()
-                except KeyError:
-                    pass
-
-            self.finalcall_map_all[guild_id].clear()
-            for data in pending_reschedule_all:
-                embed_desc, embed_fields = data.embed_desc, data.embed_fields
-                embed = discord_common.color_embed()
-                embed.description = embed_desc
-                for (name, value) in embed_fields:
-                    embed.add_field(name=name, value=value, inline=False)
-                link, start_time = self.get_values_from_embed(embed)
-                send_time = start_time - self.guild_map[guild_id].finalcall_before_all * 60
-                reaction_role = self.bot.get_guild(guild_id).get_role(data.role_id)
-                if reaction_role is not None:
-                    task = asyncio.create_task(
-                        self.send_finalcall_reminder(embed, guild_id, reaction_role, send_time, link, for_all = True))
-                    self.finalcall_map_all[guild_id][link] = FinalCallRequest(role_id=reaction_role.id, embed=embed,
-                                                                          msg_id=data.msg_id)
-                    self.finaltasks_all[guild_id][link] = task
-
-            self.logger.info(
-                f'{len(self.finalcall_map_all[guild_id])} all final calls scheduled for guild "{self.bot.get_guild(guild_id)}"')
+            self.logger.debug(
+                f'{len(records)} {tier.name} final calls scheduled for guild "{guild}", '
+                f'{rescheduled} rescheduled')
 
     @staticmethod
     def _make_contest_pages(contests, title):
-        pages = []
-        chunks = paginator.chunkify(contests, _CONTESTS_PER_PAGE)
-        for chunk in chunks:
-            embed = discord_common.color_embed()
-            for website, name, value in _get_embed_fields_from_contests(chunk):
-                embed.add_field(name=_get_display_name(website, name), value=value, inline=False)
-            pages.append((title, embed))
-        return pages
+        """Returns a factory rendering the page at an index and the page count."""
 
-    async def _send_contest_list(self, ctx, contests, *, title, empty_msg):
-        if contests is None:
-            raise RemindersCogError('Contest list not present')
-        if len(contests) == 0:
+        def make_page(index):
+            chunk = contests[index * _CONTESTS_PER_PAGE: (index + 1) * _CONTESTS_PER_PAGE]
+            embed = discord_common.color_embed()
+            for _, name, value in _get_embed_fields_from_contests(chunk):
+                embed.add_field(name=name, value=value, inline=False)
+            return title, embed
+
+        page_count = (len(contests) + _CONTESTS_PER_PAGE - 1) // _CONTESTS_PER_PAGE
+        return make_page, page_count
+
+    def _settings_changed(self, guild_id):
+        self.settings_version[guild_id] += 1
+        self.changed_guilds.add(guild_id)
+        self._refresh_reminder_channels()
+
+    def _tier_settings(self, ctx, tier):
+        return self.guild_map[ctx.guild.id][tier.name]
+
+    def _refresh_reminder_channels(self):
+        channel_ids = {}
+        for tier in tiers.TIERS:
+            for settings in self.guild_map.values():
+                if settings[tier.name].remind_channel_id is not None:
+                    channel_ids[settings[tier.name].remind_channel_id] = tier.name
+        self.reminder_channel_ids = channel_ids
+
+    def _get_contest_listing(self, guild_id, filters, *, tier, state, title):
+        """Returns the page factory and page count of the guild's contests in the given state,
+        served from the listing cache while contests and guild settings are unchanged."""
+        key = (guild_id, tier.name, state, tuple(sorted(set(filters))))
+        tag = (self.contest_generation, self.settings_version[guild_id])
+        listing = self.listing_cache.get(key, tag)
+        if listing is None:
+            contests = self.contest_lists[tier.name].get(state)
+            if contests is None:
+                raise RemindersCogError('Contest list not present')
+            contests = filter_contests(filters, self.get_guild_contests(contests, guild_id, tier))
+            make_page, page_count = self._make_contest_pages(contests, title)
+            listing = functools.lru_cache(maxsize=None)(make_page), page_count
+            self.listing_cache.put(key, tag, listing)
+        return listing
+
+    async def _send_contest_list(self, ctx, filters, tier, state, *, use_buttons=True):
+        """Pages through the listing, with buttons unless the command asks for reactions.
+        Buttons need neither reactions nor the manage_messages permission."""
+        title, empty_msg = (text.format(tier.label) for text in _LISTING_TEXTS[state])
+        make_page, page_count = self._get_contest_listing(ctx.guild.id, filters, tier=tier,
+                                                          state=state, title=title)
+        if page_count == 0:
             await ctx.send(embed=discord_common.embed_neutral(empty_msg))
             return
-        pages = self._make_contest_pages(contests, title)
-        paginator.paginate(self.bot, ctx.channel, pages, wait_time=_CONTEST_PAGINATE_WAIT_TIME,
-                           set_pagenum_footers=True)
+        paginator.paginate(self.bot, ctx.channel, make_page, page_count=page_count,
+                           wait_time=_CONTEST_PAGINATE_WAIT_TIME, set_pagenum_footers=True,
+                           use_buttons=use_buttons)
+
+    def _serve_ical_feed(self, path, query, headers):
+        """Serves /ical/<guild id>/<tier>.ics, the guild's active and future contests of the tier,
+        narrowed to the websites given as `site` shorthands in the query."""
+        match = _FEED_PATH.fullmatch(path)
+        tier = match and tiers.TIERS_BY_NAME.get(match[2])
+        guild = tier and self.bot.get_guild(int(match[1]))
+        if guild is None:
+            return http_server.Response('Not found\n', status=404)
+        sites = tuple(sorted(set(query.get('site', []))))
+        key = (guild.id, tier.name, sites)
+        tag = (self.feed_generation, self.settings_version[guild.id])
+        feed = self.feed_cache.get(key, tag)
+        if feed is None:
+            contest_lists = self.contest_lists[tier.name]
+            contests = contest_lists.get('active', []) + contest_lists.get('future', [])
+            contests = filter_contests([f'+{site}' for site in sites],
+                                       self.get_guild_contests(contests, guild.id, tier))
+            feed = ical.calendar(f'{guild.name} - {tier.title} contests',
+                                 [_render_cache.event(contest) for contest in contests])
+            self.feed_cache.put(key, tag, feed)
+        body, etag = feed
+        if ical.etag_matches(headers.get('if-none-match'), etag):
+            return http_server.Response(status=304, headers={'ETag': etag})
+        return http_server.Response(body, content_type='text/calendar; charset=utf-8', headers={'ETag': etag})
+
+    def _guild_map_data(self):
+        return {"guild_map": self.guild_map, "finalcall_maps": self.finalcall_maps}
 
     def _serialize_guild_map(self):
+        if not leader.is_leader():
+            return
         self.logger.info("Serializing db to local file")
-        data = {"guild_map": self.guild_map, "finalcall_map_div1": self.finalcall_map_div1, "finalcall_map_all": self.finalcall_map_all}
+        data = self._guild_map_data()
         out_path = Path(constants.GUILD_SETTINGS_MAP_PATH)
-        with out_path.open(mode='wb') as out_file:
-            pickle.dump(data, out_file)
+        with _SERIALIZE_SECONDS.time():
+            serialized = pickle.dumps(data)
+        _SERIALIZE_BYTES.observe(len(serialized))
+        # Write to a temporary file first so that a standby never loads a partial map.
+        tmp_path = out_path.with_suffix('.tmp')
+        with tmp_path.open(mode='wb') as out_file:
+            out_file.write(serialized)
+        os.replace(tmp_path, out_path)
 
     def _backup_serialize_guild_map(self):
+        if not leader.is_leader():
+            return
         current_time_stamp = int(dt.datetime.utcnow().timestamp())
         if current_time_stamp - self.last_guild_backup_time < _GUILD_SETTINGS_BACKUP_PERIOD:
             return
 
         self.last_guild_backup_time = current_time_stamp
         out_path = Path(constants.GUILD_SETTINGS_MAP_PATH + "_" + str(current_time_stamp))
-        data = {"guild_map": self.guild_map, "finalcall_map_div1": self.finalcall_map_div1, "finalcall_map_all": self.finalcall_map_all}
+        data = self._guild_map_data()
         with out_path.open(mode='wb') as out_file:
             pickle.dump(data, out_file)
 
@@ -468,15 +968,7 @@ class Reminders(commands.Cog):
     async def remind(self, ctx):
         await ctx.send_help(ctx.command)
 
-    @remind.command(name='configure_div1', brief='Set reminder settings for div1')
-    @commands.has_any_role('Admin', constants.REMIND_MODERATOR_ROLE)
-    async def set_remind_settings_for_div1(self, ctx, role: discord.Role, *before: int):
-        """Sets reminder channel to current channel for div1,
-        role to the given role, and reminder
-        times to the given values in minutes.
-
-        e.g t;remind configure_div1 @Subscriber 10 60 180
-        """
+    async def _configure_reminders(self, ctx, tier, role, before):
         if not role.mentionable:
             raise RemindersCogError('The role for reminders must be mentionable')
         if not before or any(before_mins < 0 for before_mins in before):
@@ -484,22 +976,35 @@ class Reminders(commands.Cog):
 
         before = list(before)
         before = sorted(before, reverse=True)
-        self.guild_map[ctx.guild.id].remind_channel_id_div1 = ctx.channel.id
-        self.guild_map[ctx.guild.id].remind_role_id_div1 = role.id
-        self.guild_map[ctx.guild.id].remind_before_div1 = before
-
-        remind_channel = ctx.guild.get_channel(self.guild_map[ctx.guild.id].remind_channel_id_div1)
-        remind_role = ctx.guild.get_role(self.guild_map[ctx.guild.id].remind_role_id_div1)
-        remind_before_str = f"At {', '.join(str(mins) for mins in self.guild_map[ctx.guild.id].remind_before_div1)} " \
+        tier_settings = self._tier_settings(ctx, tier)
+        tier_settings.remind_channel_id = ctx.channel.id
+        tier_settings.remind_role_id = role.id
+        tier_settings.remind_before = before
+        self._settings_changed(ctx.guild.id)
+
+        remind_channel = ctx.guild.get_channel(tier_settings.remind_channel_id)
+        remind_role = ctx.guild.get_role(tier_settings.remind_role_id)
+        remind_before_str = f"At {', '.join(str(mins) for mins in tier_settings.remind_before)} " \
                             f"mins before contest "
 
         embed = discord_common.embed_success('Reminder settings saved successfully')
-        embed.add_field(name='Reminder channel for div1', value=remind_channel.mention)
-        embed.add_field(name='Reminder Role for div1', value=remind_role.mention)
-        embed.add_field(name='Reminder Before for div1', value=remind_before_str)
+        embed.add_field(name=f'Reminder channel for {tier.name}', value=remind_channel.mention)
+        embed.add_field(name=f'Reminder Role for {tier.name}', value=remind_role.mention)
+        embed.add_field(name=f'Reminder Before for {tier.name}', value=remind_before_str)
 
         await ctx.send(embed=embed)
 
+    @remind.command(name='configure_div1', brief='Set reminder settings for div1')
+    @commands.has_any_role('Admin', constants.REMIND_MODERATOR_ROLE)
+    async def set_remind_settings_for_div1(self, ctx, role: discord.Role, *before: int):
+        """Sets reminder channel to current channel for div1,
+        role to the given role, and reminder
+        times to the given values in minutes.
+
+        e.g t;remind configure_div1 @Subscriber 10 60 180
+        """
+        await self._configure_reminders(ctx, tiers.DIV1, role, before)
+
     @remind.command(name='configure', brief='Set reminder settings')
     @commands.has_any_role('Admin', constants.REMIND_MODERATOR_ROLE)
     async def set_remind_settings(self, ctx, role: discord.Role, *before: int):
@@ -509,153 +1014,140 @@ class Reminders(commands.Cog):
 
         e.g t;remind configure @Subscriber 10 60 180
         """
-        if not role.mentionable:
-            raise RemindersCogError('The role for reminders must be mentionable')
-        if not before or any(before_mins < 0 for before_mins in before):
-            raise RemindersCogError('Please provide valid `before` values')
-
-        before = list(before)
-        before = sorted(before, reverse=True)
-        self.guild_map[ctx.guild.id].remind_channel_id_all = ctx.channel.id
-        self.guild_map[ctx.guild.id].remind_role_id_all = role.id
-        self.guild_map[ctx.guild.id].remind_before_all = before
-
-        remind_channel = ctx.guild.get_channel(self.guild_map[ctx.guild.id].remind_channel_id_all)
-        remind_role = ctx.guild.get_role(self.guild_map[ctx.guild.id].remind_role_id_all)
-        remind_before_str = f"At {', '.join(str(mins) for mins in self.guild_map[ctx.guild.id].remind_before_all)} " \
-                            f"mins before contest "
-
-        embed = discord_common.embed_success('Reminder settings saved successfully')
-        embed.add_field(name='Reminder channel for all', value=remind_channel.mention)
-        embed.add_field(name='Reminder Role for all', value=remind_role.mention)
-        embed.add_field(name='Reminder Before for all', value=remind_before_str)
-
-        await ctx.send(embed=embed)
+        await self._configure_reminders(ctx, tiers.ALL, role, before)
 
     @remind.command(brief='Resets the subscribed websites to the default ones')
     @commands.has_any_role('Admin', constants.REMIND_MODERATOR_ROLE)
     async def reset_subscriptions(self, ctx):
         """ Resets the judges settings to the default ones.
         """
-        self.guild_map[ctx.guild.id].subscribed_websites_div1 = set()
-        self.guild_map[ctx.guild.id].subscribed_websites_all = set()
+        for tier in tiers.TIERS:
+            self._tier_settings(ctx, tier).subscribed_websites = 0
+        self._settings_changed(ctx.guild.id)
         await ctx.send(embed=discord_common.embed_success('Succesfully reset the subscriptions to the default ones'))
 
-    def _set_guild_setting(self, guild_id, websites, unsubscribe, for_all):
+    def _set_guild_setting(self, guild_id, websites, unsubscribe, tier):
 
-        guild_settings = self.guild_map[guild_id]
+        tier_settings = self.guild_map[guild_id][tier.name]
         supported_websites, unsupported_websites = [], []
         for website in websites:
-            if website not in website_schema.schema:
+            if website not in website_schema.website_bits:
                 unsupported_websites.append(website)
                 continue
 
+            bit = website_schema.website_bits[website]
             if unsubscribe:
-                if not for_all:
-                    guild_settings.subscribed_websites_div1.discard(website)
-                else:
-                    guild_settings.subscribed_websites_all.discard(website)
+                tier_settings.subscribed_websites &= ~bit
             else:
-                if not for_all:
-                    guild_settings.subscribed_websites_div1.add(website)
-                else:
-                    guild_settings.subscribed_websites_all.add(website)
+                tier_settings.subscribed_websites |= bit
 
             supported_websites.append(website)
 
-        self.guild_map[guild_id] = guild_settings
+        self._settings_changed(guild_id)
         return supported_websites, unsupported_websites
 
-    @remind.command(brief='Start div1 contest reminders from websites.')
-    @commands.has_any_role('Admin', constants.REMIND_MODERATOR_ROLE)
-    async def subscribe_div1(self, ctx, *websites: str):
-        """Start contest reminders from websites."""
-
-        if all(website not in website_schema.schema for website in websites):
+    async def _update_subscriptions(self, ctx, tier, websites, unsubscribe):
+        if all(website not in website_schema.website_bits for website in websites):
             supported_websites = ", ".join(website_schema.supported_websites)
             embed = discord_common.embed_alert(
-                f'None of these websites are supported for div1 contest reminders.'
+                f'None of these websites are supported for {tier.label}contest reminders.'
                 f'\nSupported websites -\n {supported_websites}.')
         else:
-            guild_id = ctx.guild.id
-            subscribed, unsupported = self._set_guild_setting(guild_id, websites, unsubscribe = False, for_all = False)
-            subscribed_websites_str = ", ".join(subscribed)
+            changed, unsupported = self._set_guild_setting(ctx.guild.id, websites, unsubscribe, tier)
+            changed_websites_str = ", ".join(changed)
             unsupported_websites_str = ", ".join(unsupported)
-            success_str = f'Successfully subscribed from  {subscribed_websites_str} for div1 contest reminders.'
-            success_str += f'\n{unsupported_websites_str} {"are" if len(unsupported) > 1 else "is"} \
-                not supported.' if unsupported_websites_str else ""
+            if unsubscribe:
+                success_str = f'Successfully unsubscribed from {changed_websites_str} for {tier.label}contest reminders.'
+            else:
+                success_str = f'Successfully subscribed to {changed_websites_str} for {tier.label}contest reminders.'
+            success_str += f'\n{unsupported_websites_str} {"are" if len(unsupported) > 1 else "is"} ' \
+                           f'not supported.' if unsupported_websites_str else ""
             embed = discord_common.embed_success(success_str)
         await ctx.send(embed=embed)
 
+    @remind.command(brief='Start div1 contest reminders from websites.')
+    @commands.has_any_role('Admin', constants.REMIND_MODERATOR_ROLE)
+    async def subscribe_div1(self, ctx, *websites: str):
+        """Start contest reminders from websites."""
+        await self._update_subscriptions(ctx, tiers.DIV1, websites, unsubscribe=False)
+
     @remind.command(brief='Stop div1 contest reminders from websites.')
     @commands.has_any_role('Admin', constants.REMIND_MODERATOR_ROLE)
     async def unsubscribe_div1(self, ctx, *websites: str):
         """Stop contest reminders from websites."""
-
-        if all(website not in website_schema.schema for website in websites):
-            supported_websites = ", ".join(website_schema.supported_websites)
-            embed = discord_common.embed_alert(f'None of these websites are supported for div1 contest reminders.'
-                                               f'\nSupported websites -\n {supported_websites}.')
-        else:
-            guild_id = ctx.guild.id
-            unsubscribed, unsupported = self._set_guild_setting(guild_id, websites, unsubscribe = True, for_all = False)
-            unsubscribed_websites_str = ", ".join(unsubscribed)
-            unsupported_websites_str = ", ".join(unsupported)
-            success_str = f'Successfully unsubscribed from {unsubscribed_websites_str} for div1 contest reminders.'
-            success_str += f'\n{unsupported_websites_str} \
-                {"are" if len(unsupported) > 1 else "is"} \
-                not supported.' if unsupported_websites_str else ""
-            embed = discord_common.embed_success(success_str)
-        await ctx.send(embed=embed)
+        await self._update_subscriptions(ctx, tiers.DIV1, websites, unsubscribe=True)
 
     @remind.command(brief='Start contest reminders from websites.')
     @commands.has_any_role('Admin', constants.REMIND_MODERATOR_ROLE)
     async def subscribe(self, ctx, *websites: str):
         """Start contest reminders from websites."""
-
-        if all(website not in website_schema.schema for website in websites):
-            supported_websites = ", ".join(website_schema.supported_websites)
-            embed = discord_common.embed_alert(
-                f'None of these websites are supported for contest reminders.'
-                f'\nSupported websites -\n {supported_websites}.')
-        else:
-            guild_id = ctx.guild.id
-            subscribed, unsupported = self._set_guild_setting(guild_id, websites, unsubscribe = False, for_all = True)
-            subscribed_websites_str = ", ".join(subscribed)
-            unsupported_websites_str = ", ".join(unsupported)
-            success_str = f'Successfully subscribed from  {subscribed_websites_str} for contest reminders.'
-            success_str += f'\n{unsupported_websites_str} {"are" if len(unsupported) > 1 else "is"} \
-                not supported.' if unsupported_websites_str else ""
-            embed = discord_common.embed_success(success_str)
-        await ctx.send(embed=embed)
+        await self._update_subscriptions(ctx, tiers.ALL, websites, unsubscribe=False)
 
     @remind.command(brief='Stop contest reminders from websites.')
     @commands.has_any_role('Admin', constants.REMIND_MODERATOR_ROLE)
     async def unsubscribe(self, ctx, *websites: str):
         """Stop contest reminders from websites."""
-
-        if all(website not in website_schema.schema for website in websites):
-            supported_websites = ", ".join(website_schema.supported_websites)
-            embed = discord_common.embed_alert(f'None of these websites are supported for contest reminders.'
-                                               f'\nSupported websites -\n {supported_websites}.')
-        else:
-            guild_id = ctx.guild.id
-            unsubscribed, unsupported = self._set_guild_setting(guild_id, websites, unsubscribe = True, for_all = True)
-            unsubscribed_websites_str = ", ".join(unsubscribed)
-            unsupported_websites_str = ", ".join(unsupported)
-            success_str = f'Successfully unsubscribed from {unsubscribed_websites_str} for contest reminders.'
-            success_str += f'\n{unsupported_websites_str} \
-                {"are" if len(unsupported) > 1 else "is"} \
-                not supported.' if unsupported_websites_str else ""
-            embed = discord_common.embed_success(success_str)
-        await ctx.send(embed=embed)
+        await self._update_subscriptions(ctx, tiers.ALL, websites, unsubscribe=True)
 
     @remind.command(brief='Clear all reminder settings')
     @commands.has_any_role('Admin', constants.REMIND_MODERATOR_ROLE)
     async def clear(self, ctx):
         del self.guild_map[ctx.guild.id]
+        self._settings_changed(ctx.guild.id)
         await ctx.send(embed=discord_common.embed_success('Reminder settings cleared'))
 
+    @remind.command(name='me', brief='Get contest reminders from a website by direct message')
+    async def personal_subscribe(self, ctx, website: str, *before: int):
+        """Sends you a direct message the given minutes before every contest of the website.
+
+        e.g t;remind me codeforces.com 10 60
+        """
+        if website not in website_schema.website_bits:
+            supported_websites = ", ".join(website_schema.supported_websites)
+            raise RemindersCogError(f'`{website}` is not supported.\nSupported websites -\n {supported_websites}.')
+        if not before or any(before_mins < 0 for before_mins in before):
+            raise RemindersCogError('Please provide valid `before` values')
+        subscriptions = self.personal.of_user(ctx.author.id)
+        if len(set(subscriptions) | {(website, before_mins) for before_mins in before}) > _PERSONAL_SUBSCRIPTION_LIMIT:
+            raise RemindersCogError(f'You can have at most {_PERSONAL_SUBSCRIPTION_LIMIT} personal reminders')
+        for before_mins in before:
+            self.personal.subscribe(ctx.author.id, website, before_mins)
+        self.personal.save()
+        self._schedule_personal_reminders()
+        before_str = ', '.join(str(before_mins) for before_mins in sorted(set(before), reverse=True))
+        await ctx.send(embed=discord_common.embed_success(
+            f'You will get a direct message {before_str} mins before {website} contests'))
+
+    @remind.command(name='stop', brief='Stop personal contest reminders from a website')
+    async def personal_unsubscribe(self, ctx, website: str, *before: int):
+        """Stops your personal reminders from the website, only at the given minutes if any.
+
+        e.g t;remind stop codeforces.com 60
+        """
+        removed = 0
+        for before_mins in before or [None]:
+            removed += self.personal.unsubscribe(ctx.author.id, website, before_mins)
+        if not removed:
+            raise RemindersCogError(f'You have no personal reminders from `{website}` to stop')
+        self.personal.save()
+        self._schedule_personal_reminders()
+        await ctx.send(embed=discord_common.embed_success(f'Stopped {removed} personal reminders from {website}'))
+
+    @remind.command(name='mine', brief='Show your personal contest reminders')
+    async def personal_list(self, ctx):
+        subscriptions = self.personal.of_user(ctx.author.id)
+        if not subscriptions:
+            await ctx.send(embed=discord_common.embed_neutral('You have no personal reminders'))
+            return
+        before_by_website = defaultdict(list)
+        for website, before_mins in subscriptions:
+            before_by_website[website].append(before_mins)
+        embed = discord_common.embed_neutral('Your personal reminders')
+        for website, before in before_by_website.items():
+            embed.add_field(name=website, value=f"At {', '.join(str(mins) for mins in reversed(before))} "
+                                                f"mins before contest", inline=False)
+        await ctx.send(embed=embed)
+
     @commands.group(brief='Commands for listing contests', invoke_without_command=True)
     async def clist(self, ctx):
         """
@@ -671,302 +1163,304 @@ class Reminders(commands.Cog):
     @clist.command(brief='List future div1 contests')
     async def future_div1(self, ctx, *filters):
         """List future contests."""
-        contests = filter_contests(filters, self.get_guild_contests(self.future_contests_div1, ctx.guild.id)[0])
-        await self._send_contest_list(ctx, contests, title='Future div1 contests', empty_msg='No future div1 contests scheduled')
+        await self._send_contest_list(ctx, filters, tiers.DIV1, 'future')
 
     @clist.command(brief='List active div1 contests')
     async def active_div1(self, ctx, *filters):
         """List active contests."""
-        contests = filter_contests(filters, self.get_guild_contests(self.active_contests_div1, ctx.guild.id)[0])
-        await self._send_contest_list(ctx, contests, title='Active div1 contests', empty_msg='No div1 contests currently active')
+        await self._send_contest_list(ctx, filters, tiers.DIV1, 'active')
 
     @clist.command(brief='List recent div1 finished contests')
     async def finished_div1(self, ctx, *filters):
         """List recently concluded contests."""
-        contests = filter_contests(filters, self.get_guild_contests(self.finished_contests_div1, ctx.guild.id)[0])
-        await self._send_contest_list(ctx, contests, title='Recently finished div1 contests',
-                                      empty_msg='No finished contests found')
+        await self._send_contest_list(ctx, filters, tiers.DIV1, 'finished')
 
     @clist.command(brief='List future contests')
     async def future(self, ctx, *filters):
         """List future contests."""
-        contests = filter_contests(filters, self.get_guild_contests(self.future_contests_all, ctx.guild.id)[1])
-        await self._send_contest_list(ctx, contests, title='Future contests', empty_msg='No future contests scheduled')
+        await self._send_contest_list(ctx, filters, tiers.ALL, 'future')
 
     @clist.command(brief='List active contests')
     async def active(self, ctx, *filters):
         """List active contests."""
-        contests = filter_contests(filters, self.get_guild_contests(self.active_contests_all, ctx.guild.id)[1])
-        await self._send_contest_list(ctx, contests, title='Active contests', empty_msg='No contests currently active')
+        await self._send_contest_list(ctx, filters, tiers.ALL, 'active')
 
     @clist.command(brief='List recent finished contests')
     async def finished(self, ctx, *filters):
         """List recently concluded contests."""
-        contests = filter_contests(filters, self.get_guild_contests(self.finished_contests_all, ctx.guild.id)[1])
-        await self._send_contest_list(ctx, contests, title='Recently finished contests',
-                                      empty_msg='No finished contests found')
+        await self._send_contest_list(ctx, filters, tiers.ALL, 'finished')
 
-    async def send_finalcall_reminder(self, embed, guild_id, role, send_time, link, for_all):
+    def _make_finalcall_embed(self, record, before_secs):
+        contest = self.contests_by_id.get(record.contest_id)
+        if contest is not None:
+            desc, (_, name, value) = _render_cache.reminder(contest, before_secs)
+        else:
+            desc = f'About to start in {_format_before(before_secs)}!'
+            name, value = record.name, f'<t:{record.start_time}:F>\n[link]({record.link})'
+        embed = discord_common.color_embed(description=desc)
+        embed.add_field(name=name, value=value, inline=False)
+        return embed
+
+    @staticmethod
+    def _make_personal_embed(contest, before_secs):
+        desc, (_, name, value) = _render_cache.reminder(contest, before_secs)
+        embed = discord_common.color_embed(description=desc)
+        if contest.is_rare():
+            embed.set_footer(text="Its once in a while contest, you wouldn't wanna miss 👀")
+        embed.add_field(name=name, value=value, inline=False)
+        return embed
+
+    async def send_finalcall_reminder(self, guild_id, record, send_time):
         send_msg = "GLHF!"
-        settings = self.guild_map[guild_id]
-        finalcall_before = settings.finalcall_before_div1 if not for_all else settings.finalcall_before_all
-        finalcall_channel_id = settings.finalcall_channel_id_div1 if not for_all else settings.finalcall_channel_id_all
+        tier_settings = self.guild_map[guild_id][record.tier]
+        finalcall_before = tier_settings.finalcall_before
+        finalcall_channel_id = tier_settings.finalcall_channel_id
+        finalcall_map, finaltasks = self.finalcall_maps[record.tier], self.finaltasks[record.tier]
+        guild = self.bot.get_guild(guild_id)
 
         # sleep till the ping time
         delay = send_time - dt.datetime.now().timestamp()
-        if delay >= 0:
+        # A final call missed while the bot was down is still sent within the grace period.
+        if delay >= 0 or (record.msg_id is None and delay >= -outbox_module.GRACE_PERIOD):
             await asyncio.sleep(delay)
-
-            def make(value, label):
-                tmp = f'{value} {label}'
-                return tmp if value == 1 else tmp + 's'
-
-            labels = 'day hr min sec'.split()
-            values = discord_common.time_format(finalcall_before * 60)
-            before_str = ' '.join(make(value, label) for label, value in zip(labels, values) if value > 0)
-            desc = f'About to start in {before_str}!'
-            embed.description = desc
+            if not leader.is_leader():
+                return
+            dispatched = time.time()
+            embed = self._make_finalcall_embed(record, finalcall_before * 60)
+            role = guild.get_role(record.role_id)
             channel = self.bot.get_channel(finalcall_channel_id)
             msg = await channel.send(role.mention + " " + send_msg, embed=embed)
-            if not for_all:
-                self.finalcall_map_div1[guild_id][link].msg_id = msg.id
-            else:
-                self.finalcall_map_all[guild_id][link].msg_id = msg.id
+            lateness_tracker.record(guild_id, record.tier, 'finalcall', send_time, dispatched, time.time())
+            record.msg_id = msg.id
             self._serialize_guild_map()
 
         # sleep till contest starts
-        time_to_contest = max(0, send_time + finalcall_before * 60 - dt.datetime.utcnow().timestamp())
+        time_to_contest = max(0, record.start_time - dt.datetime.utcnow().timestamp())
         await asyncio.sleep(time_to_contest)
+        if not leader.is_leader():
+            return
 
         # delete role and task
-        if not for_all:
-            if link in self.finalcall_map_div1[guild_id]:
-                msg_id = self.finalcall_map_div1[guild_id][link].msg_id
-                message = await self.bot.get_channel(finalcall_channel_id).fetch_message(msg_id)
-                await message.edit(content=send_msg)
-                del self.finalcall_map_div1[guild_id][link]
-                del self.finaltasks_div1[guild_id][link]
-        else:
-            if link in self.finalcall_map_all[guild_id]:
-                msg_id = self.finalcall_map_all[guild_id][link].msg_id
-                message = await self.bot.get_channel(finalcall_channel_id).fetch_message(msg_id)
+        if finalcall_map[guild_id].get(record.link) is record:
+            if record.msg_id is not None:
+                message = self.bot.get_channel(finalcall_channel_id).get_partial_message(record.msg_id)
                 await message.edit(content=send_msg)
-                del self.finalcall_map_all[guild_id][link]
-                del self.finaltasks_all[guild_id][link]
+            del finalcall_map[guild_id][record.link]
+            finaltasks[guild_id].pop(record.link, None)
+        role = guild.get_role(record.role_id)
         if role is not None:
-            await role.delete()
+            await self.role_pool.release(role)
         self._serialize_guild_map()
 
     @staticmethod
     def get_values_from_embed(embed):
-        desc = embed.fields[0].value
-        link = re.findall(r']\((http.+)\)', desc)[0]
-        start_time = int(re.findall(r'<t:(\d+):[A-za-z]>', desc)[0])
-        return link, start_time
-
-    async def create_finalcall_role(self, guild_id, embed, for_all):
-        contest_name = embed.fields[0].name
-        name = f"Final Call {'(Div1)' if not for_all else '(All)'} - {contest_name}"
-        role = await self.bot.get_guild(guild_id).create_role(name=name, mentionable=True)
-        return role
-
-    async def get_finalcall_taskrole(self, guild_id, embed, remove, for_all):
+        return _get_values_from_field_value(embed.fields[0].value)
+
+    async def create_finalcall_role(self, guild_id, contest_name, tier):
+        name = f"{FINALCALL_ROLE_PREFIX} ({tier.title}) - {contest_name}"
+        return await self.role_pool.lease(self.bot.get_guild(guild_id), name)
+
+    async def get_finalcall_taskrole(self, guild_id, reminder, remove, tier):
         guild = self.bot.get_guild(guild_id)
-        link, start_time = self.get_values_from_embed(embed)
-        finalcall_before = self.guild_map[guild_id].finalcall_before_div1 if not for_all else self.guild_map[guild_id].finalcall_before_all
+        link, start_time = reminder.link, reminder.start_time
+        finalcall_before = self.guild_map[guild_id][tier.name].finalcall_before
         send_time = start_time - finalcall_before * 60
-
-        if not for_all:
-            if link in self.finalcall_map_div1[guild_id]:
-                reaction_role = guild.get_role(self.finalcall_map_div1[guild_id][link].role_id)
-            elif (not remove) and send_time > dt.datetime.utcnow().timestamp():
-                reaction_role = await self.create_finalcall_role(guild_id, embed, for_all)
-                task = asyncio.create_task(self.send_finalcall_reminder(embed, guild_id, reaction_role, send_time, link, for_all = False))
-                self.finalcall_map_div1[guild_id][link] = FinalCallRequest(embed=embed, role_id=reaction_role.id)
-                self.finaltasks_div1[guild_id][link] = task
-            else:
-                reaction_role = None
+        finalcall_map, finaltasks = self.finalcall_maps[tier.name], self.finaltasks[tier.name]
+
+        if link in finalcall_map[guild_id]:
+            reaction_role = guild.get_role(finalcall_map[guild_id][link].role_id)
+        elif (not remove) and send_time > dt.datetime.utcnow().timestamp():
+            reaction_role = await self.create_finalcall_role(guild_id, reminder.name, tier)
+            record = FinalCallRecord(contest_id=reminder.contest_id, link=link, name=reminder.name,
+                                     start_time=start_time, role_id=reaction_role.id, tier=tier.name)
+            task = asyncio.create_task(self.send_finalcall_reminder(guild_id, record, send_time))
+            finalcall_map[guild_id][link] = record
+            finaltasks[guild_id][link] = (send_time, task)
         else:
-            if link in self.finalcall_map_all[guild_id]:
-                reaction_role = guild.get_role(self.finalcall_map_all[guild_id][link].role_id)
-            elif (not remove) and send_time > dt.datetime.utcnow().timestamp():
-                reaction_role = await self.create_finalcall_role(guild_id, embed, for_all)
-                task = asyncio.create_task(self.send_finalcall_reminder(embed, guild_id, reaction_role, send_time, link, for_all = True))
-                self.finalcall_map_all[guild_id][link] = FinalCallRequest(embed=embed, role_id=reaction_role.id)
-                self.finaltasks_all[guild_id][link] = task
-            else:
-                reaction_role = None
+            reaction_role = None
 
         return reaction_role
 
-    async def do_validation_check(self, payload, for_all):
-        settings = self.guild_map[payload.guild_id]
+    async def _fetch_reminder_message(self, payload, tier):
+        """Rebuilds the index entry of a reminder posted before the last restart."""
+        channel = self.bot.get_channel(payload.channel_id)
+        message = await channel.fetch_message(payload.message_id)
+        if not message.embeds or not message.embeds[0].fields:
+            return None
+
+        embed = message.embeds[0]
+        try:
+            link, start_time = self.get_values_from_embed(embed)
+        except IndexError:
+            return None
+        contest_id = next((contest.id for contest in self.contests_by_id.values() if contest.url == link), None)
+        reactors = sum(reaction.count - reaction.me for reaction in message.reactions
+                       if str(reaction) == self.reaction_emoji)
+        reminder = ReminderMessage(guild_id=payload.guild_id, tier=tier.name,
+                                   contest_id=contest_id, link=link, name=embed.fields[0].name,
+                                   start_time=start_time, reactors=reactors)
+        return self.message_index.add(payload.message_id, reminder)
+
+    async def do_validation_check(self, payload, tier):
+        """Returns the reminder the reaction is on and whether it had to be fetched,
+        in which case its reactor count already includes this event."""
+        tier_settings = self.guild_map[payload.guild_id][tier.name]
         member = self.bot.get_guild(payload.guild_id).get_member(payload.user_id)
-        remind_channel_id = settings.remind_channel_id_div1 if not for_all else settings.remind_channel_id_all
-        finalcall_channel_id = settings.finalcall_channel_id_div1 if not for_all else settings.finalcall_channel_id_all
+        remind_channel_id = tier_settings.remind_channel_id
+        finalcall_channel_id = tier_settings.finalcall_channel_id
 
         if member.bot or remind_channel_id is None or remind_channel_id != payload.channel_id \
             or payload.emoji.name != self.reaction_emoji or finalcall_channel_id is None:
             return None
 
-        channel = self.bot.get_channel(payload.channel_id)
-        message = await channel.fetch_message(payload.message_id)
-        reaction_count = sum(reaction.count for reaction in message.reactions if str(reaction) == self.reaction_emoji)
+        reminder = self.message_index.get(payload.message_id)
+        if reminder is not None:
+            return reminder, False
 
-        if not message.embeds:
+        reminder = await self._fetch_reminder_message(payload, tier)
+        if reminder is None:
             return None
-
-        return reaction_count, message.embeds[0]
+        return reminder, True
 
     async def victim_card(self, member):
         self.logger.error(f'Failed to send DM to {member}')
 
     @commands.Cog.listener()
     async def on_raw_reaction_add(self, payload):
-        for_all = payload.channel_id == self.guild_map[payload.guild_id].remind_channel_id_all
+        if payload.channel_id not in self.reminder_channel_ids:
+            return
+        with _REACTION_SECONDS.time(event='add'):
+            await self._on_reminder_reaction_add(payload)
 
-        response = await self.do_validation_check(payload, for_all)
-        if response is None:
+    def _reaction_tier(self, payload):
+        """The tier of the reminder channel the reaction is in, if it should be handled at all."""
+        tier_name = self.reminder_channel_ids.get(payload.channel_id)
+        if tier_name is None or not leader.is_leader() or payload.emoji.name != self.reaction_emoji:
+            return None
+        return tiers.TIERS_BY_NAME.get(tier_name)
+
+    async def _on_reminder_reaction_add(self, payload):
+        tier = self._reaction_tier(payload)
+        if tier is None:
             return
 
-        settings = self.guild_map[payload.guild_id]
+        response = await self.do_validation_check(payload, tier)
+        if response is None:
+            return
 
-        _, embed = response
-        _, start_time = self.get_values_from_embed(embed)
-        finalcall_before = settings.finalcall_before_div1 if not for_all else settings.finalcall_before_all
-        send_time = start_time - finalcall_before * 60
+        reminder, fetched = response
+        if not fetched:
+            reminder.reactors += 1
+        finalcall_before = self.guild_map[payload.guild_id][tier.name].finalcall_before
+        send_time = reminder.start_time - finalcall_before * 60
 
         if send_time < dt.datetime.utcnow().timestamp():
             return
 
-        reaction_role = await self.get_finalcall_taskrole(payload.guild_id, embed, remove = False, for_all = for_all)
+        reaction_role = await self.get_finalcall_taskrole(payload.guild_id, reminder, remove=False, tier=tier)
         member = self.bot.get_guild(payload.guild_id).get_member(payload.user_id)
         self.logger.info(
             f'{member} reacted for {reaction_role} which will be sent at {datetime.fromtimestamp(send_time)}')
         await member.add_roles(reaction_role)
-        member_dm = await member.create_dm()
         self._serialize_guild_map()
-        try:
-            await member_dm.send(f"Final Call Alarm Set. You are alloted `{reaction_role.name}` which will be pinged"
-                                 f" {finalcall_before} mins before the contest")
-        except:
-            await self.victim_card(member)
+        self.dm_queue.notify(member, (payload.guild_id, reminder.link), 'set',
+                             f"Final Call Alarm Set. You are alloted `{reaction_role.name}` which will be pinged"
+                             f" {finalcall_before} mins before the contest")
 
     @commands.Cog.listener()
     async def on_raw_reaction_remove(self, payload):
-        for_all = payload.channel_id == self.guild_map[payload.guild_id].remind_channel_id_all
+        if payload.channel_id not in self.reminder_channel_ids:
+            return
+        with _REACTION_SECONDS.time(event='remove'):
+            await self._on_reminder_reaction_remove(payload)
+
+    async def _on_reminder_reaction_remove(self, payload):
+        tier = self._reaction_tier(payload)
+        if tier is None:
+            return
 
-        response = await self.do_validation_check(payload, for_all)
+        response = await self.do_validation_check(payload, tier)
         if response is None:
             return
 
-        reaction_count, embed = response
-        reaction_role = await self.get_finalcall_taskrole(payload.guild_id, embed, remove = True, for_all = for_all)
+        reminder, fetched = response
+        if not fetched:
+            reminder.reactors = max(0, reminder.reactors - 1)
+        reaction_role = await self.get_finalcall_taskrole(payload.guild_id, reminder, remove=True, tier=tier)
 
-        link, _ = self.get_values_from_embed(embed)
+        link = reminder.link
+        finalcall_map, finaltasks = self.finalcall_maps[tier.name], self.finaltasks[tier.name]
         if reaction_role is None:
-            assert link not in (self.finalcall_map_div1[payload.guild_id] if not for_all else self.finalcall_map_all[payload.guild_id])
+            assert link not in finalcall_map[payload.guild_id]
             return
 
         member = self.bot.get_guild(payload.guild_id).get_member(payload.user_id)
-        self.logger.info(f'{member} unreacted for {reaction_role.name} {"(div1)" if not for_all else "(all)"}')
+        self.logger.info(f'{member} unreacted for {reaction_role.name} ({tier.name})')
         await member.remove_roles(reaction_role)
-        member_dm = await member.create_dm()
-        try:
-            await member_dm.send(f"Final Call Alarm Cleared for '{reaction_role.name}' {'(div1)' if not for_all else '(all)'}")
-        except:
-            await self.victim_card(member)
-
-        if reaction_count == 1:
-            if not for_all:
-                if link in self.finalcall_map_div1[payload.guild_id]:
-                    self.finaltasks_div1[payload.guild_id][link].cancel()
-                    del self.finalcall_map_div1[payload.guild_id][link]
-                    del self.finaltasks_div1[payload.guild_id][link]
-            else:
-                if link in self.finalcall_map_all[payload.guild_id]:
-                    self.finaltasks_all[payload.guild_id][link].cancel()
-                    del self.finalcall_map_all[payload.guild_id][link]
-                    del self.finaltasks_all[payload.guild_id][link]
-            await reaction_role.delete()
+        self.dm_queue.notify(member, (payload.guild_id, link), 'cleared',
+                             f"Final Call Alarm Cleared for '{reaction_role.name}' ({tier.name})")
+
+        if reminder.reactors == 0:
+            if link in finalcall_map[payload.guild_id]:
+                scheduled = finaltasks[payload.guild_id].pop(link, None)
+                if scheduled is not None:
+                    scheduled[1].cancel()
+                del finalcall_map[payload.guild_id][link]
+            await self.role_pool.release(reaction_role)
         self._serialize_guild_map()
 
-    @commands.Cog.listener()
-    async def on_message(self, message):
-        if message.guild is None:
-            return
-        settings = self.guild_map[message.guild.id]
-        for_all = message.channel.id == settings.remind_channel_id_all
-        remind_channel_id = settings.remind_channel_id_div1 if not for_all else settings.remind_channel_id_all
-        if message.channel.id != remind_channel_id or not message.embeds:
-            return
-
-        remind_role_id = settings.remind_role_id_div1 if not for_all else settings.remind_role_id_all
-        remind_role = self.bot.get_guild(message.guild.id).get_role(remind_role_id)
-        if remind_role in message.role_mentions:
-            await message.add_reaction(self.reaction_emoji)
-
     @commands.group(brief="Manage Final Call Reminder", invoke_without_command=True)
     async def final(self, ctx):
         await ctx.send_help(ctx.command)
 
-    @final.command(name='configure_div1', brief='Set channel for the div1 final call')
-    @commands.has_any_role('Admin', constants.REMIND_MODERATOR_ROLE)
-    async def set_finalcall_settings_div1(self, ctx, before: int):
+    async def _configure_finalcall(self, ctx, tier, before):
         if not before or before < 0:
             raise RemindersCogError('Please provide valid `before` values')
 
-        self.guild_map[ctx.guild.id].finalcall_before_div1 = before
-        self.guild_map[ctx.guild.id].finalcall_channel_id_div1 = ctx.channel.id
+        tier_settings = self._tier_settings(ctx, tier)
+        tier_settings.finalcall_before = before
+        tier_settings.finalcall_channel_id = ctx.channel.id
+        self._settings_changed(ctx.guild.id)
 
-        finalcall_channel = ctx.guild.get_channel(self.guild_map[ctx.guild.id].finalcall_channel_id_div1)
+        finalcall_channel = ctx.guild.get_channel(tier_settings.finalcall_channel_id)
 
-        embed = discord_common.embed_success('Final call settings for division 1 saved successfully')
-        embed.add_field(name='Final Call Channel (Div1)', value=finalcall_channel.mention)
-        embed.add_field(name='Final Call Before (Div1)',
-                        value=f"{self.guild_map[ctx.guild.id].finalcall_before_div1} mins before contest")
+        embed = discord_common.embed_success(f'Final call settings for {tier.description} saved successfully')
+        embed.add_field(name=f'Final Call Channel ({tier.title})', value=finalcall_channel.mention)
+        embed.add_field(name=f'Final Call Before ({tier.title})',
+                        value=f"{tier_settings.finalcall_before} mins before contest")
 
         await ctx.send(embed=embed)
 
+    @final.command(name='configure_div1', brief='Set channel for the div1 final call')
+    @commands.has_any_role('Admin', constants.REMIND_MODERATOR_ROLE)
+    async def set_finalcall_settings_div1(self, ctx, before: int):
+        await self._configure_finalcall(ctx, tiers.DIV1, before)
+
     @final.command(name='configure', brief='Set channel for the final call')
     @commands.has_any_role('Admin', constants.REMIND_MODERATOR_ROLE)
     async def set_finalcall_settings(self, ctx, before: int):
-        if not before or before < 0:
-            raise RemindersCogError('Please provide valid `before` values')
-
-        self.guild_map[ctx.guild.id].finalcall_before_all = before
-        self.guild_map[ctx.guild.id].finalcall_channel_id_all = ctx.channel.id
-
-        finalcall_channel = ctx.guild.get_channel(self.guild_map[ctx.guild.id].finalcall_channel_id_all)
-
-        embed = discord_common.embed_success('Final call settings for all saved successfully')
-        embed.add_field(name='Final Call Channel (All)', value=finalcall_channel.mention)
-        embed.add_field(name='Final Call Before (All)',
-                        value=f"{self.guild_map[ctx.guild.id].finalcall_before_all} mins before contest")
-
-        await ctx.send(embed=embed)
+        await self._configure_finalcall(ctx, tiers.ALL, before)
 
     @commands.command(brief='Get Info about guild', invoke_without_command=True)
     async def settings(self, ctx):
         """Shows the current settings for the guild"""
-        settings = self.guild_map[ctx.guild.id]
-
-        for for_all in [False, True]:
-            remind_channel = ctx.guild.get_channel(settings.remind_channel_id_div1 if not for_all else settings.remind_channel_id_all)
-            remind_role = ctx.guild.get_role(settings.remind_role_id_div1 if not for_all else settings.remind_role_id_all)
-            finalcall_channel = ctx.guild.get_channel(settings.finalcall_channel_id_div1 if not for_all else settings.finalcall_channel_id_all)
-            subscribed_websites_str = ", ".join(settings.subscribed_websites_div1 if not for_all else settings.subscribed_websites_all)
+        for tier in tiers.TIERS:
+            tier_settings = self._tier_settings(ctx, tier)
+            remind_channel = ctx.guild.get_channel(tier_settings.remind_channel_id)
+            remind_role = ctx.guild.get_role(tier_settings.remind_role_id)
+            finalcall_channel = ctx.guild.get_channel(tier_settings.finalcall_channel_id)
+            subscribed_websites_str = ", ".join(website_schema.mask_websites(tier_settings.subscribed_websites))
 
             remind_before_str = "Not Set"
             final_before_str = "Not Set"
-            remind_before = settings.remind_before_div1 if not for_all else settings.remind_before_all
+            remind_before = tier_settings.remind_before
             if remind_before is not None:
                 remind_before_str = f"At {', '.join(str(before_mins) for before_mins in remind_before)}" \
                                     f" mins before contest"
-            finalcall_before = settings.finalcall_before_div1 if not for_all else settings.finalcall_before_all
+            finalcall_before = tier_settings.finalcall_before
             if finalcall_before is not None:
                 final_before_str = f"At {finalcall_before} mins before contest"
-            embed = discord_common.embed_success(f'Current {"div1 " if not for_all else ""}settings')
+            embed = discord_common.embed_success(f'Current {tier.label}settings')
 
             if remind_channel is not None:
                 embed.add_field(name='Remind Channel', value=remind_channel.mention)
@@ -993,6 +1487,9 @@ class Reminders(commands.Cog):
             embed.set_footer(text=ctx.guild.name, icon_url=ctx.guild.icon)
             await ctx.send(embed=embed)
 
+    async def cog_unload(self):
+        self.save_schedule_snapshot()
+
     @discord_common.send_error_if(RemindersCogError)
     async def cog_command_error(self, ctx, error):
         pass
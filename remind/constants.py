@@ -5,6 +5,17 @@ LOGS_DIR = 'logs'
 CONTESTS_DB_FILE_PATH = os.path.join(DATA_DIR, 'contests.json')
 LOG_FILE_PATH = os.path.join(LOGS_DIR, 'remind.log')
 GUILD_SETTINGS_MAP_PATH = os.path.join(DATA_DIR, 'guild_settings_map')
+# Cluster workers keep their own guild map and fall back to this one on first start.
+SHARED_GUILD_SETTINGS_MAP_PATH = GUILD_SETTINGS_MAP_PATH
+SCHEDULE_SNAPSHOT_PATH = os.path.join(DATA_DIR, 'schedule_snapshot')
+REMINDER_OUTBOX_PATH = os.path.join(DATA_DIR, 'reminder_outbox.jsonl')
+PERSONAL_SUBSCRIPTIONS_PATH = os.path.join(DATA_DIR, 'personal_subscriptions')
 ALL_DIRS = (attrib_value for attrib_name, attrib_value in list(globals().items()) if attrib_name.endswith('DIR'))
 SUPER_USERS = []
+# Set for worker processes of a multi-process shard cluster, only cluster 0 queries clist.
+CLUSTER_ID = None
+PROCESS_START_TIME = None
+# Ports serving the metrics and the iCalendar feeds, which are off unless set.
+METRICS_PORT = None
+ICAL_PORT = None
 REMIND_MODERATOR_ROLE = "RemindMod"
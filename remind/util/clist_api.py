@@ -3,8 +3,12 @@ import os
 import datetime as dt
 import requests
 import json
+import threading
+import time
 
 from remind import constants
+from remind.util import leader
+from remind.util import metrics
 from discord.ext import commands
 
 from pathlib import Path
@@ -12,6 +16,11 @@ from pathlib import Path
 logger = logging.getLogger(__name__)
 URL_BASE = 'https://clist.by/api/v2/contest'
 _CLIST_API_TIME_DIFFERENCE = 30 * 60  # seconds
+# Startup and the refresh loop both call `cache` from executor threads.
+_cache_lock = threading.Lock()
+
+_FETCH_SECONDS = metrics.histogram('remind_clist_fetch_seconds', 'Latency of clist API requests')
+_FETCH_BYTES = metrics.bytes_histogram('remind_clist_fetch_bytes', 'Payload size of clist API responses')
 
 
 class ClistApiError(commands.CommandError):
@@ -43,7 +52,10 @@ def _query_api():
     }
 
     try:
+        start = time.perf_counter()
         resp = requests.get(URL_BASE, params=param)
+        _FETCH_SECONDS.observe(time.perf_counter() - start)
+        _FETCH_BYTES.observe(len(resp.content))
         if resp.status_code != 200:
             raise ClistApiError
         return resp.json()['objects']
@@ -53,6 +65,19 @@ def _query_api():
 
 
 def cache(forced=False):
+    """Refreshes the contests db file from clist when it is stale.
+
+    Only the first process of a shard cluster, and only the leader in high availability
+    mode, queries clist. The others share its db file.
+    """
+    if constants.CLUSTER_ID not in (None, 0) or not leader.is_leader():
+        return
+
+    with _cache_lock:
+        _cache(forced)
+
+
+def _cache(forced):
     current_time_stamp = dt.datetime.utcnow().timestamp()
     db_file = Path(constants.CONTESTS_DB_FILE_PATH)
 
@@ -74,5 +99,8 @@ def cache(forced=False):
         return
 
     db = {'querytime': current_time_stamp, 'objects': contests}
-    with open(db_file, 'w') as f:
+    # Write to a temporary file first so that other processes never read a partial db.
+    tmp_file = db_file.with_name(f'{db_file.stem}.{os.getpid()}.tmp')
+    with open(tmp_file, 'w') as f:
         json.dump(db, f)
+    os.replace(tmp_file, db_file)
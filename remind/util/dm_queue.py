@@ -0,0 +1,99 @@
+import asyncio
+import logging
+from collections import OrderedDict
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+_FLUSH_DELAY = 5  # seconds
+_SEND_INTERVAL = 0.5  # seconds
+_MAX_RETRIES = 3
+_DM_CHANNEL_CACHE_SIZE = 1000
+
+
+class DMQueue:
+    """Background queue of direct messages to members.
+
+    Notifications are keyed per member and subject. A notification reverting a
+    pending one of the same subject, e.g. an alarm cleared right after being set,
+    drops both, and all pending notifications of a member are sent as one message.
+    Messages are sent in a paced loop so callers never wait on the REST API.
+    """
+
+    def __init__(self, *, on_failure=None, flush_delay=_FLUSH_DELAY, send_interval=_SEND_INTERVAL):
+        self.on_failure = on_failure
+        self.flush_delay = flush_delay
+        self.send_interval = send_interval
+        # Maps user id to (member, OrderedDict of subject to (state, text)).
+        self.pending = OrderedDict()
+        self.retries = {}
+        self.dm_channels = OrderedDict()
+        self.wakeup = asyncio.Event()
+        self.task = None
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self._send_task())
+
+    def __len__(self):
+        return len(self.pending)
+
+    def notify(self, member, subject, state, text):
+        _, notes = self.pending.setdefault(member.id, (member, OrderedDict()))
+        pending = notes.get(subject)
+        if pending is not None and pending[0] != state:
+            del notes[subject]
+            if not notes:
+                del self.pending[member.id]
+            return
+        notes[subject] = (state, text)
+        self.wakeup.set()
+
+    async def _get_dm_channel(self, member):
+        channel = self.dm_channels.get(member.id)
+        if channel is None:
+            channel = member.dm_channel or await member.create_dm()
+            self.dm_channels[member.id] = channel
+            if len(self.dm_channels) > _DM_CHANNEL_CACHE_SIZE:
+                self.dm_channels.popitem(last=False)
+        else:
+            self.dm_channels.move_to_end(member.id)
+        return channel
+
+    async def _send(self, member, notes):
+        try:
+            channel = await self._get_dm_channel(member)
+            await channel.send('\n'.join(text for _, text in notes.values()))
+            self.retries.pop(member.id, None)
+        except discord.Forbidden:
+            if self.on_failure is not None:
+                await self.on_failure(member)
+        except discord.HTTPException as e:
+            retries = self.retries.get(member.id, 0) + 1
+            if retries > _MAX_RETRIES:
+                del self.retries[member.id]
+                logger.warning(f'Giving up on DM to {member}: {e!r}')
+                if self.on_failure is not None:
+                    await self.on_failure(member)
+                return
+            self.retries[member.id] = retries
+            # Put the notes back unless newer ones arrived meanwhile.
+            _, pending_notes = self.pending.setdefault(member.id, (member, OrderedDict()))
+            for subject, note in notes.items():
+                pending_notes.setdefault(subject, note)
+            self.wakeup.set()
+
+    async def _send_task(self):
+        while True:
+            await self.wakeup.wait()
+            # Give toggles and further notifications a moment to coalesce.
+            await asyncio.sleep(self.flush_delay)
+            self.wakeup.clear()
+            while self.pending:
+                _, (member, notes) = self.pending.popitem(last=False)
+                try:
+                    await self._send(member, notes)
+                except Exception as e:
+                    logger.exception(f'Failed to send DM to {member}: {e!r}')
+                await asyncio.sleep(self.send_interval)
@@ -0,0 +1,81 @@
+import asyncio
+import functools
+import logging
+from collections import defaultdict
+from urllib.parse import urlsplit, parse_qs
+
+logger = logging.getLogger(__name__)
+
+_REASONS = {200: 'OK', 304: 'Not Modified', 404: 'Not Found', 405: 'Method Not Allowed', 500: 'Internal Server Error'}
+_MAX_HEADER_LINES = 100
+
+# Maps port to path prefix to handler, so every endpoint is only served on its own port.
+_routes = defaultdict(dict)
+# Maps port to its server.
+_servers = {}
+
+
+class Response:
+    def __init__(self, body=b'', *, status=200, content_type='text/plain; charset=utf-8', headers=None):
+        self.body = body.encode() if isinstance(body, str) else body
+        self.status = status
+        self.headers = {'Content-Type': content_type, **(headers or {})}
+
+
+def add_route(port, prefix, handler):
+    """Serves GET requests on `port` for paths starting with `prefix` through `handler`.
+
+    Handlers are called with the path, the parsed query and the lowercased request
+    headers, and return a `Response`.
+    """
+    _routes[port][prefix] = handler
+
+
+def _find_handler(routes, path):
+    matches = [prefix for prefix in routes if path.startswith(prefix)]
+    return routes[max(matches, key=len)] if matches else None
+
+
+async def _handle(routes, reader, writer):
+    try:
+        request_line = (await reader.readline()).decode('latin-1').split()
+        headers = {}
+        for _ in range(_MAX_HEADER_LINES):
+            line = (await reader.readline()).decode('latin-1')
+            if line in ('\r\n', '\n', ''):
+                break
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        if len(request_line) < 2 or request_line[0] not in ('GET', 'HEAD'):
+            response = Response('Method not allowed\n', status=405)
+        else:
+            url = urlsplit(request_line[1])
+            handler = _find_handler(routes, url.path)
+            if handler is None:
+                response = Response('Not found\n', status=404)
+            else:
+                try:
+                    response = handler(url.path, parse_qs(url.query), headers)
+                except Exception as e:
+                    logger.exception(f'Failed to serve {url.path}: {e!r}')
+                    response = Response('Internal server error\n', status=500)
+
+        body = b'' if request_line and request_line[0] == 'HEAD' else response.body
+        head = [f'HTTP/1.1 {response.status} {_REASONS.get(response.status, "")}',
+                f'Content-Length: {len(body)}', 'Connection: close']
+        head += [f'{name}: {value}' for name, value in response.headers.items()]
+        writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + body)
+        await writer.drain()
+    except (ConnectionError, UnicodeDecodeError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start(host, port):
+    """Starts the local HTTP server of a port, once per process."""
+    if port not in _servers:
+        _servers[port] = await asyncio.start_server(functools.partial(_handle, _routes[port]), host, port)
+        logger.info(f'HTTP server listening on {host}:{port}')
+    return _servers[port]
@@ -0,0 +1,58 @@
+import hashlib
+
+_LINE_LIMIT = 75  # octets, longer content lines are folded
+_TIME_FORMAT = '%Y%m%dT%H%M%SZ'
+
+
+def _escape(text):
+    return (text.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+            .replace('\r\n', '\\n').replace('\n', '\\n'))
+
+
+def _fold(line):
+    """Splits a content line into chunks of at most 75 octets, without splitting characters."""
+    chunks, chunk, size = [], '', 0
+    for char in line:
+        char_size = len(char.encode())
+        # Continuation lines start with a space, which counts towards their limit.
+        if size + char_size > _LINE_LIMIT:
+            chunks.append(chunk)
+            chunk, size = ' ', 1
+        chunk += char
+        size += char_size
+    chunks.append(chunk)
+    return '\r\n'.join(chunks)
+
+
+def event(*, uid, start, end, summary, url):
+    """Renders a VEVENT, `start` and `end` are naive UTC datetimes."""
+    lines = [
+        'BEGIN:VEVENT',
+        f'UID:{uid}',
+        # Stamped with the start rather than the render time so that an unchanged feed
+        # renders to the same bytes and keeps its ETag.
+        f'DTSTAMP:{start.strftime(_TIME_FORMAT)}',
+        f'DTSTART:{start.strftime(_TIME_FORMAT)}',
+        f'DTEND:{end.strftime(_TIME_FORMAT)}',
+        f'SUMMARY:{_escape(summary)}',
+        f'URL:{url}',
+        f'DESCRIPTION:{_escape(url)}',
+        'END:VEVENT',
+    ]
+    return '\r\n'.join(_fold(line) for line in lines)
+
+
+def calendar(name, events):
+    """Renders a VCALENDAR of pre-rendered events, returns the body and its ETag."""
+    lines = ['BEGIN:VCALENDAR', 'VERSION:2.0', 'PRODID:-//Remind-Me//Contest reminders//EN',
+             'CALSCALE:GREGORIAN', _fold(f'X-WR-CALNAME:{_escape(name)}'), *events, 'END:VCALENDAR']
+    body = ('\r\n'.join(lines) + '\r\n').encode()
+    return body, f'"{hashlib.sha1(body).hexdigest()}"'
+
+
+def etag_matches(if_none_match, etag):
+    """Tells whether an If-None-Match header value matches the ETag."""
+    if if_none_match is None:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in tags or any(tag in (etag, f'W/{etag}') for tag in tags)
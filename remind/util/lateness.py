@@ -0,0 +1,50 @@
+import math
+from collections import defaultdict, deque
+
+from remind.util import metrics
+
+_WINDOW_SIZE = 500
+_PERCENTILES = (50, 95, 99)
+
+_LATENESS_SECONDS = metrics.histogram('remind_delivery_lateness_seconds',
+                                      'Delay between the intended and acknowledged send time of reminders',
+                                      buckets=(.1, .25, .5, 1, 2.5, 5, 10, 30, 60, 300))
+
+
+def percentile(sorted_values, pct):
+    """Nearest rank percentile of a sorted, non empty list."""
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class LatenessTracker:
+    """Rolling window of how late reminders and final calls were dispatched and
+    acknowledged by Discord, compared with their intended send time."""
+
+    def __init__(self, window_size=_WINDOW_SIZE):
+        # Maps (guild id, tier, kind) to a window of (dispatch lateness, acknowledge lateness).
+        self.windows = defaultdict(lambda: deque(maxlen=window_size))
+
+    def record(self, guild_id, tier, kind, intended, dispatched, acknowledged):
+        self.windows[guild_id, tier, kind].append((dispatched - intended, acknowledged - intended))
+        _LATENESS_SECONDS.observe(acknowledged - intended, tier=tier, kind=kind)
+
+    def summary(self, guild_id=None):
+        """Returns (tier, kind, sample count, dispatch percentiles, acknowledge percentiles) rows
+        for the guild, or across all guilds."""
+        merged = defaultdict(list)
+        for (window_guild_id, tier, kind), window in self.windows.items():
+            if guild_id is None or window_guild_id == guild_id:
+                merged[tier, kind].extend(window)
+
+        rows = []
+        for (tier, kind), samples in sorted(merged.items()):
+            dispatched = sorted(sample[0] for sample in samples)
+            acknowledged = sorted(sample[1] for sample in samples)
+            rows.append((tier, kind, len(samples),
+                         [percentile(dispatched, pct) for pct in _PERCENTILES],
+                         [percentile(acknowledged, pct) for pct in _PERCENTILES]))
+        return rows
+
+
+tracker = LatenessTracker()
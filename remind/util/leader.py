@@ -0,0 +1,101 @@
+import asyncio
+import logging
+import os
+import socket
+import sqlite3
+import time
+
+logger = logging.getLogger(__name__)
+
+_LEASE_TTL = 10  # seconds
+_LEASE_NAME = 'remind'
+
+_election = None
+_promotion_listeners = []
+
+
+class LeaderElection:
+    """Leader election between instances sharing a SQLite lease file.
+
+    The leader renews its lease every third of the lease time to live, a standby
+    takes the lease over once it has expired. Renewals run in an executor since
+    SQLite blocks while another instance holds the lock.
+    """
+
+    def __init__(self, path, *, ttl=_LEASE_TTL, holder=None):
+        self.path = path
+        self.ttl = ttl
+        self.holder = holder or f'{socket.gethostname()}:{os.getpid()}'
+        # Expiry of the lease while this instance holds it.
+        self.expires = 0
+        with self._connect() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS lease (name TEXT PRIMARY KEY, holder TEXT, expires REAL)')
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=self.ttl / 3, isolation_level=None)
+
+    @property
+    def is_leader(self):
+        # Checked against the expiry rather than cached, so that an instance whose loop
+        # stalled past the lease stops dispatching once a standby may have taken over.
+        return time.time() < self.expires
+
+    def try_acquire(self):
+        """Takes or renews the lease, returns its expiry if this instance holds it and 0 otherwise."""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute('SELECT holder, expires FROM lease WHERE name = ?', (_LEASE_NAME,)).fetchone()
+            if row is None or row[0] == self.holder or row[1] < now:
+                expires = now + self.ttl
+                conn.execute('INSERT OR REPLACE INTO lease (name, holder, expires) VALUES (?, ?, ?)',
+                             (_LEASE_NAME, self.holder, expires))
+            else:
+                expires = 0
+            conn.execute('COMMIT')
+            return expires
+        except sqlite3.Error as e:
+            logger.warning(f'Leader lease update failed: {e!r}')
+            return 0
+        finally:
+            conn.close()
+
+    def update(self, expires):
+        """Records the outcome of `try_acquire`, returns whether this instance just became the leader."""
+        was_leader = self.is_leader
+        self.expires = expires
+        if self.is_leader != was_leader:
+            logger.warning(f'{self.holder} is now {"the leader" if self.is_leader else "on standby"}')
+        return self.is_leader and not was_leader
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.ttl / 3)
+            expires = await asyncio.get_running_loop().run_in_executor(None, self.try_acquire)
+            if self.update(expires):
+                for listener in _promotion_listeners:
+                    try:
+                        await listener()
+                    except Exception as e:
+                        logger.exception(f'Promotion listener failed: {e!r}')
+
+
+def start(path, ttl=_LEASE_TTL):
+    """Enables high availability mode with the lease at the given path."""
+    global _election
+    _election = LeaderElection(path, ttl=ttl)
+    # Nothing else runs yet, so the first attempt may block.
+    _election.update(_election.try_acquire())
+    asyncio.create_task(_election.run())
+    return _election
+
+
+def is_leader():
+    """Whether this instance should dispatch, always true outside high availability mode."""
+    return _election is None or _election.is_leader
+
+
+def add_promotion_listener(listener):
+    """Registers a coroutine function to call when this instance becomes the leader."""
+    _promotion_listeners.append(listener)
@@ -0,0 +1,146 @@
+import time
+from contextlib import contextmanager
+
+from remind.util import http_server
+
+_DEFAULT_BUCKETS = (.005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10, 30, 60)
+_BYTES_BUCKETS = (1e3, 1e4, 1e5, 1e6, 1e7)
+
+# Maps metric name to metric, in registration order.
+_registry = {}
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{value}"' for name, value in labels) + '}'
+
+
+class Metric:
+    type = None
+
+    def __init__(self, name, documentation):
+        self.name = name
+        self.documentation = documentation
+
+    def samples(self):
+        """Yields (name suffix, labels, value) triples, labels being a sorted tuple of pairs."""
+        raise NotImplementedError
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.type}']
+        for suffix, labels, value in self.samples():
+            lines.append(f'{self.name}{suffix}{_format_labels(labels)} {value}')
+        return '\n'.join(lines)
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def __init__(self, name, documentation):
+        super().__init__(name, documentation)
+        self.values = {}
+
+    def inc(self, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def samples(self):
+        for labels, value in self.values.items():
+            yield '', labels, value
+
+
+class Gauge(Metric):
+    """A gauge either set explicitly or read from `callback` at scrape time, which
+    returns a number or a dict mapping label tuples to numbers."""
+    type = 'gauge'
+
+    def __init__(self, name, documentation, callback=None):
+        super().__init__(name, documentation)
+        self.callback = callback
+        self.values = {}
+
+    def set(self, value, **labels):
+        self.values[tuple(sorted(labels.items()))] = value
+
+    def samples(self):
+        if self.callback is None:
+            values = self.values
+        else:
+            values = self.callback()
+            if not isinstance(values, dict):
+                values = {(): values}
+        for labels, value in values.items():
+            yield '', labels, value
+
+
+class Histogram(Metric):
+    type = 'histogram'
+
+    def __init__(self, name, documentation, buckets=_DEFAULT_BUCKETS):
+        super().__init__(name, documentation)
+        self.buckets = tuple(buckets)
+        # Maps label tuple to [bucket counts, sum, count].
+        self.values = {}
+
+    def observe(self, value, **labels):
+        key = tuple(sorted(labels.items()))
+        entry = self.values.get(key)
+        if entry is None:
+            entry = self.values[key] = [[0] * len(self.buckets), 0.0, 0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                entry[0][i] += 1
+        entry[1] += value
+        entry[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self):
+        for labels, (counts, total, count) in self.values.items():
+            for bound, bucket_count in zip(self.buckets, counts):
+                yield '_bucket', labels + (('le', bound),), bucket_count
+            yield '_bucket', labels + (('le', '+Inf'),), count
+            yield '_sum', labels, total
+            yield '_count', labels, count
+
+
+def _register(metric):
+    # Re-registering, e.g. when a cog is reloaded, replaces the previous metric.
+    _registry[metric.name] = metric
+    return metric
+
+
+def counter(name, documentation):
+    return _register(Counter(name, documentation))
+
+
+def gauge(name, documentation, callback=None):
+    return _register(Gauge(name, documentation, callback))
+
+
+def histogram(name, documentation, buckets=_DEFAULT_BUCKETS):
+    return _register(Histogram(name, documentation, buckets))
+
+
+def bytes_histogram(name, documentation):
+    return histogram(name, documentation, _BYTES_BUCKETS)
+
+
+def render():
+    """Renders all metrics in the Prometheus text exposition format."""
+    return '\n'.join(metric.render() for metric in _registry.values()) + '\n'
+
+
+def _serve_metrics(path, query, headers):
+    return http_server.Response(render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+def enable(port):
+    http_server.add_route(port, '/metrics', _serve_metrics)
@@ -0,0 +1,102 @@
+import json
+import logging
+import os
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Reminders missed by less than this, e.g. while the bot was restarting, are still sent.
+GRACE_PERIOD = 15 * 60  # seconds
+_COMPACT_EVERY = 5000  # journal lines
+
+DISPATCHING = 'dispatching'
+DELIVERED = 'delivered'
+
+
+def reminder_key(guild_id, tier, contest_id, before_secs, send_time):
+    # The send time is part of the key, so a postponed contest is reminded of again.
+    return f'{guild_id}:{tier}:{contest_id}:{before_secs}:{int(send_time)}'
+
+
+class Outbox:
+    """Append only journal of reminder deliveries.
+
+    A reminder is journaled right before it is sent and once Discord acknowledged
+    it, so that after a restart the reminders which fell due while the bot was down
+    can be told apart from the ones already sent. Scheduled reminders are not
+    journaled, they are worked out again from the guild settings and contests.
+    The journal is rewritten without the entries past the grace period once it
+    holds `compact_every` lines and twice as many as there are live entries.
+    """
+
+    def __init__(self, path, *, grace_period=GRACE_PERIOD, compact_every=_COMPACT_EVERY):
+        self.path = Path(path)
+        self.grace_period = grace_period
+        self.compact_every = compact_every
+        # Maps reminder key to the latest record of its delivery.
+        self.entries = {}
+        self.appended = 0
+        self._journal = None
+
+    def load(self):
+        self._close()
+        self.entries.clear()
+        self.appended = 0
+        try:
+            with self.path.open() as journal:
+                for line in journal:
+                    try:
+                        record = json.loads(line)
+                        self.entries[record['key']] = {'state': record['state'], 'send_time': record['send_time']}
+                    except (ValueError, KeyError, TypeError):
+                        # A torn last line from a crash mid write.
+                        continue
+                    self.appended += 1
+        except FileNotFoundError:
+            pass
+
+    def _close(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def _append(self, key, state, send_time, now):
+        self.entries[key] = {'state': state, 'send_time': send_time}
+        try:
+            if self._journal is None:
+                # Line buffered, every record reaches the file as soon as it is written.
+                self._journal = self.path.open('a', buffering=1)
+            self._journal.write(json.dumps({'key': key, 'state': state, 'send_time': send_time}) + '\n')
+        except OSError as e:
+            logger.warning(f'Failed to journal reminder {key}: {e!r}')
+            return
+        self.appended += 1
+        # Compacting only once the journal doubled keeps appends amortized constant time
+        # however many reminders are live.
+        if self.appended >= max(self.compact_every, 2 * len(self.entries)):
+            self.compact(now)
+
+    def mark_dispatching(self, key, send_time, now):
+        self._append(key, DISPATCHING, send_time, now)
+
+    def mark_delivered(self, key, send_time, now):
+        self._append(key, DELIVERED, send_time, now)
+
+    def state(self, key):
+        entry = self.entries.get(key)
+        return entry and entry['state']
+
+    def compact(self, now):
+        self.entries = {key: entry for key, entry in self.entries.items()
+                        if entry['send_time'] >= now - self.grace_period}
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        try:
+            with tmp_path.open('w') as journal:
+                for key, entry in self.entries.items():
+                    journal.write(json.dumps(dict(entry, key=key)) + '\n')
+            self._close()
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f'Failed to compact the reminder outbox: {e!r}')
+            return
+        self.appended = len(self.entries)
@@ -1,10 +1,19 @@
 import asyncio
 import functools
+import logging
+from collections import Counter, OrderedDict
+
+import discord
 
 _REACT_FIRST = '\N{BLACK LEFT-POINTING DOUBLE TRIANGLE WITH VERTICAL BAR}'
 _REACT_PREV = '\N{BLACK LEFT-POINTING TRIANGLE}'
 _REACT_NEXT = '\N{BLACK RIGHT-POINTING TRIANGLE}'
 _REACT_LAST = '\N{BLACK RIGHT-POINTING DOUBLE TRIANGLE WITH VERTICAL BAR}'
+_PAGE_CACHE_SIZE = 5
+_MAX_LIVE_PAGINATORS = 500
+_MAX_PAGINATORS_PER_CHANNEL = 5
+
+logger = logging.getLogger(__name__)
 
 
 def chunkify(sequence, chunk_size):
@@ -25,21 +34,89 @@ class InsufficientPermissionsError(PaginatorError):
     pass
 
 
+class _PaginatorView(discord.ui.View):
+    """Navigation buttons of a paginator, each click is answered with a single
+    interaction response that edits the message in place."""
+
+    def __init__(self, paginated):
+        # Expiry is handled by the router, like for reaction paginators.
+        super().__init__(timeout=None)
+        self.paginated = paginated
+
+    async def _show(self, interaction, page_num):
+        paginated = self.paginated
+        paginated.router.touch(paginated.message.id)
+        if not 1 <= page_num <= paginated.page_count or page_num == paginated.cur_page:
+            await interaction.response.defer()
+            return
+        content, embed = paginated.get_page(page_num)
+        paginated.cur_page = page_num
+        await interaction.response.edit_message(content=content, embed=embed)
+
+    @discord.ui.button(emoji=_REACT_FIRST, style=discord.ButtonStyle.secondary)
+    async def first(self, interaction, button):
+        await self._show(interaction, 1)
+
+    @discord.ui.button(emoji=_REACT_PREV, style=discord.ButtonStyle.secondary)
+    async def prev(self, interaction, button):
+        await self._show(interaction, self.paginated.cur_page - 1)
+
+    @discord.ui.button(emoji=_REACT_NEXT, style=discord.ButtonStyle.secondary)
+    async def next(self, interaction, button):
+        await self._show(interaction, self.paginated.cur_page + 1)
+
+    @discord.ui.button(emoji=_REACT_LAST, style=discord.ButtonStyle.secondary)
+    async def last(self, interaction, button):
+        await self._show(interaction, self.paginated.page_count)
+
+
 class Paginated:
-    def __init__(self, pages):
-        self.pages = pages
+    """Pages are either a sequence of (content, embed) pairs or a factory taking a
+    0-based page index, together with the page count. Pages are rendered only the
+    first time they are shown and a few recently shown ones are kept around.
+
+    With `use_buttons` navigation happens through message components instead of
+    reactions, which needs no setup calls and one interaction response per click.
+    """
+
+    def __init__(self, pages, *, page_count=None, set_pagenum_footers=False, use_buttons=False):
+        if callable(pages):
+            self.page_factory = pages
+            self.page_count = page_count
+        else:
+            self.page_factory = pages.__getitem__
+            self.page_count = len(pages) if page_count is None else page_count
+        self.set_pagenum_footers = set_pagenum_footers
+        self.use_buttons = use_buttons
+        self.view = None
+        self.router = None
+        self.page_cache = OrderedDict()
         self.cur_page = None
         self.message = None
         self.reaction_map = {
             _REACT_FIRST: functools.partial(self.show_page, 1),
             _REACT_PREV: self.prev_page,
             _REACT_NEXT: self.next_page,
-            _REACT_LAST: functools.partial(self.show_page, len(pages))
+            _REACT_LAST: functools.partial(self.show_page, self.page_count)
         }
 
+    def get_page(self, page_num):
+        try:
+            self.page_cache.move_to_end(page_num)
+            return self.page_cache[page_num]
+        except KeyError:
+            pass
+        content, embed = self.page_factory(page_num - 1)
+        if self.page_count > 1 and self.set_pagenum_footers:
+            embed.set_footer(text=f'Page {page_num} / {self.page_count}')
+        self.page_cache[page_num] = content, embed
+        if len(self.page_cache) > _PAGE_CACHE_SIZE:
+            self.page_cache.popitem(last=False)
+        return content, embed
+
     async def show_page(self, page_num):
-        if 1 <= page_num <= len(self.pages):
-            content, embed = self.pages[page_num - 1]
+        if 1 <= page_num <= self.page_count:
+            content, embed = self.get_page(page_num)
             await self.message.edit(content=content, embed=embed)
             self.cur_page = page_num
 
@@ -50,42 +127,128 @@ class Paginated:
         await self.show_page(self.cur_page + 1)
 
     async def paginate(self, bot, channel, wait_time):
-        content, embed = self.pages[0]
-        self.message = await channel.send(content, embed=embed)
-
-        if len(self.pages) == 1:
+        content, embed = self.get_page(1)
+        if self.use_buttons and self.page_count > 1:
+            self.view = _PaginatorView(self)
+            self.message = await channel.send(content, embed=embed, view=self.view)
+        else:
+            self.message = await channel.send(content, embed=embed)
+
+        if self.page_count == 1:
             # No need to paginate.
             return
 
         self.cur_page = 1
-        for react in self.reaction_map.keys():
-            await self.message.add_reaction(react)
-
-        def check(reaction, user):
-            return (bot.user != user and
-                    reaction.message.id == self.message.id and
-                    reaction.emoji in self.reaction_map)
-
-        while True:
-            try:
-                reaction, user = await bot.wait_for('reaction_add',
-                                                    timeout=wait_time,
-                                                    check=check)
-                await reaction.remove(user)
-                await self.reaction_map[reaction.emoji]()
-            except asyncio.TimeoutError:
+        if self.view is None:
+            for react in self.reaction_map.keys():
+                await self.message.add_reaction(react)
+        self.router = _get_router(bot)
+        self.router.register(self, wait_time)
+
+    async def close(self):
+        try:
+            if self.view is not None:
+                self.view.stop()
+                await self.message.edit(view=None)
+            else:
                 await self.message.clear_reactions()
-                break
+        except Exception as e:
+            logger.warning(f'Failed to clear paginator controls: {e!r}')
+
+
+class PaginatorRouter:
+    """Dispatches reactions to live paginators by message id from a single listener.
+
+    The pool of live paginators is bounded: the least recently used paginator is
+    evicted when the pool is full, and so is the least recently used one of a
+    channel which already has too many live paginators.
+    """
+
+    def __init__(self, bot, *, max_paginators=_MAX_LIVE_PAGINATORS,
+                 max_per_channel=_MAX_PAGINATORS_PER_CHANNEL):
+        self.bot = bot
+        self.max_paginators = max_paginators
+        self.max_per_channel = max_per_channel
+        # Maps message id to (paginated, expiry handle) in least recently used order.
+        self.paginators = OrderedDict()
+        self.channel_counts = Counter()
+        bot.add_listener(self.on_reaction_add, 'on_reaction_add')
+
+    def __len__(self):
+        return len(self.paginators)
+
+    def register(self, paginated, wait_time):
+        channel_id = paginated.message.channel.id
+        if self.channel_counts[channel_id] >= self.max_per_channel:
+            oldest = next(message_id for message_id, (other, _) in self.paginators.items()
+                          if other.message.channel.id == channel_id)
+            self.evict(oldest)
+        if len(self.paginators) >= self.max_paginators:
+            self.evict(next(iter(self.paginators)))
+
+        message_id = paginated.message.id
+        handle = asyncio.get_running_loop().call_later(wait_time, self.evict, message_id)
+        self.paginators[message_id] = paginated, handle
+        self.channel_counts[channel_id] += 1
+
+    def touch(self, message_id):
+        """Marks the paginator as the most recently used one, on every navigation."""
+        if message_id in self.paginators:
+            self.paginators.move_to_end(message_id)
+
+    def evict(self, message_id):
+        entry = self.paginators.pop(message_id, None)
+        if entry is None:
+            return
+        paginated, handle = entry
+        handle.cancel()
+        channel_id = paginated.message.channel.id
+        self.channel_counts[channel_id] -= 1
+        if not self.channel_counts[channel_id]:
+            del self.channel_counts[channel_id]
+        asyncio.create_task(paginated.close())
+
+    async def on_reaction_add(self, reaction, user):
+        entry = self.paginators.get(reaction.message.id)
+        if entry is None or user == self.bot.user:
+            return
+        paginated, _ = entry
+        if paginated.view is not None or reaction.emoji not in paginated.reaction_map:
+            return
+        self.touch(reaction.message.id)
+        await reaction.remove(user)
+        await paginated.reaction_map[reaction.emoji]()
+
+
+_routers = {}
+
+
+def _get_router(bot):
+    router = _routers.get(bot)
+    if router is None:
+        router = _routers[bot] = PaginatorRouter(bot)
+    return router
+
+
+def live_paginator_count(bot):
+    router = _routers.get(bot)
+    return len(router) if router is not None else 0
+
 
+def paginate(bot, channel, pages, *, wait_time, set_pagenum_footers=False, page_count=None, use_buttons=False):
+    """Sends the pages to the channel and lets users flip through them with reactions,
+    or with buttons when `use_buttons` is set.
 
-def paginate(bot, channel, pages, *, wait_time, set_pagenum_footers=False):
-    if not pages:
+    `pages` may be a sequence or a factory of pages, the latter requires `page_count`.
+    """
+    if page_count is None:
+        page_count = len(pages)
+    if not page_count:
         raise NoPagesError()
-    permissions = channel.permissions_for(channel.guild.me)
-    if not permissions.manage_messages:
-        raise InsufficientPermissionsError('Permission to manage messages required')
-    if len(pages) > 1 and set_pagenum_footers:
-        for i, (content, embed) in enumerate(pages):
-            embed.set_footer(text=f'Page {i + 1} / {len(pages)}')
-    paginated = Paginated(pages)
+    if not use_buttons:
+        permissions = channel.permissions_for(channel.guild.me)
+        if not permissions.manage_messages:
+            raise InsufficientPermissionsError('Permission to manage messages required')
+    paginated = Paginated(pages, page_count=page_count, set_pagenum_footers=set_pagenum_footers,
+                          use_buttons=use_buttons)
     asyncio.create_task(paginated.paginate(bot, channel, wait_time))
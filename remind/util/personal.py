@@ -0,0 +1,175 @@
+import asyncio
+import heapq
+import logging
+import os
+import pickle
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import discord
+
+from remind.util import leader
+from remind.util import metrics
+
+logger = logging.getLogger(__name__)
+
+_WORKER_COUNT = 8
+# Discord allows 50 requests a second overall, leave room for channel reminders and commands.
+_SENDS_PER_SECOND = 20
+_MAX_RETRIES = 3
+_RETRY_DELAY = 30  # seconds, doubled on every retry
+
+_PERSONAL_DMS = metrics.counter('remind_personal_dms', 'Personal reminder direct messages by outcome')
+
+
+class PersonalSubscriptions:
+    """Members' personal reminder subscriptions, indexed from (website, minutes before)
+    to the ids of the subscribed users so that a reminder fans out with one lookup."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.index = defaultdict(set)
+
+    def load(self):
+        try:
+            with self.path.open('rb') as in_file:
+                index = pickle.load(in_file)
+        except FileNotFoundError:
+            return
+        except (pickle.UnpicklingError, EOFError, ValueError, AttributeError, TypeError) as e:
+            logger.error(f'Failed to load personal subscriptions from {self.path}, starting without them: {e!r}')
+            self.index = defaultdict(set)
+            return
+        self.index = defaultdict(set, index)
+
+    def save(self):
+        if not leader.is_leader():
+            return
+        tmp_path = self.path.with_suffix('.tmp')
+        with tmp_path.open('wb') as out_file:
+            pickle.dump(dict(self.index), out_file)
+        os.replace(tmp_path, self.path)
+
+    def subscribe(self, user_id, website, before_mins):
+        self.index[website, before_mins].add(user_id)
+
+    def unsubscribe(self, user_id, website, before_mins=None):
+        """Drops the user's subscriptions to the website, to all offsets unless one is given.
+        Returns the number of subscriptions dropped."""
+        removed = 0
+        for key in [key for key in self.index if key[0] == website and before_mins in (None, key[1])]:
+            users = self.index[key]
+            if user_id in users:
+                users.discard(user_id)
+                removed += 1
+            if not users:
+                del self.index[key]
+        return removed
+
+    def of_user(self, user_id):
+        """Sorted (website, minutes before) pairs the user is subscribed to."""
+        return sorted(key for key, users in self.index.items() if user_id in users)
+
+    def offsets(self, website):
+        return [before_mins for (key_website, before_mins), users in self.index.items()
+                if key_website == website and users]
+
+    def users(self, website, before_mins):
+        return self.index.get((website, before_mins), ())
+
+
+class PersonalDispatcher:
+    """Sends personal reminders by direct message.
+
+    A heap holds a single (send time, contest id, minutes before, contest) entry per
+    contest and subscribed offset, however many users subscribed to it. When an
+    entry falls due it is fanned out to its subscribers through a pool of workers
+    paced to a shared send rate, failed sends are retried with backoff.
+    """
+
+    def __init__(self, bot, subscriptions, make_embed, *, workers=_WORKER_COUNT,
+                 sends_per_second=_SENDS_PER_SECOND):
+        self.bot = bot
+        self.subscriptions = subscriptions
+        # Renders the embed of a reminder from the contest and seconds before it.
+        self.make_embed = make_embed
+        self.workers = workers
+        self.send_interval = 1 / sends_per_second
+        self.heap = []
+        self.queue = asyncio.Queue()
+        self.wakeup = asyncio.Event()
+        # Send time of the last fanned out entry, rebuilt heaps start after it.
+        self.fired_until = time.time()
+        self.next_send = 0
+        self.tasks = []
+
+    def start(self):
+        if self.tasks:
+            return
+        self.tasks.append(asyncio.create_task(self._timer_task()))
+        self.tasks.extend(asyncio.create_task(self._worker()) for _ in range(self.workers))
+
+    def __len__(self):
+        return self.queue.qsize()
+
+    def schedule(self, contests, start_epoch):
+        """Rebuilds the heap from the future contests, `start_epoch` maps a contest to its start."""
+        heap = []
+        for contest in contests:
+            for before_mins in self.subscriptions.offsets(contest.website):
+                send_time = start_epoch(contest) - before_mins * 60
+                if send_time > self.fired_until:
+                    heap.append((send_time, contest.id, before_mins, contest))
+        heapq.heapify(heap)
+        self.heap = heap
+        self.wakeup.set()
+
+    async def _timer_task(self):
+        while True:
+            self.wakeup.clear()
+            if not self.heap:
+                await self.wakeup.wait()
+                continue
+            delay = self.heap[0][0] - time.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            self.fired_until, _, before_mins, contest = heapq.heappop(self.heap)
+            if not leader.is_leader():
+                continue
+            for user_id in list(self.subscriptions.users(contest.website, before_mins)):
+                self.queue.put_nowait((user_id, contest, before_mins, 0))
+
+    async def _pace(self):
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        wait = self.next_send - now
+        self.next_send = max(now, self.next_send) + self.send_interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    async def _worker(self):
+        while True:
+            user_id, contest, before_mins, attempt = await self.queue.get()
+            await self._pace()
+            try:
+                user = self.bot.get_user(user_id) or await self.bot.fetch_user(user_id)
+                await user.send(embed=self.make_embed(contest, before_mins * 60))
+                _PERSONAL_DMS.inc(outcome='sent')
+            except discord.Forbidden:
+                # DMs closed, the user keeps the subscription in case they open them again.
+                _PERSONAL_DMS.inc(outcome='forbidden')
+            except discord.HTTPException as e:
+                if attempt >= _MAX_RETRIES:
+                    _PERSONAL_DMS.inc(outcome='failed')
+                    logger.warning(f'Giving up on personal reminder to {user_id}: {e!r}')
+                    continue
+                _PERSONAL_DMS.inc(outcome='retried')
+                asyncio.get_running_loop().call_later(_RETRY_DELAY * 2 ** attempt, self.queue.put_nowait,
+                                                      (user_id, contest, before_mins, attempt + 1))
+            except Exception as e:
+                logger.exception(f'Failed to send personal reminder to {user_id}: {e!r}')
@@ -0,0 +1,71 @@
+import logging
+from collections import defaultdict
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+FINALCALL_ROLE_PREFIX = 'Final Call'
+_MAX_IDLE_ROLES_PER_GUILD = 10
+_MAX_STRIPPED_MEMBERS = 5
+
+
+class RolePool:
+    """Per guild pool of reusable final call roles.
+
+    Roles are leased to contests and renamed on lease instead of being created,
+    and are returned to the pool once their final call is over instead of being
+    deleted. Members still holding a pooled role are stripped when it is leased
+    again, which costs a request each, so roles held by more than `max_stripped`
+    members are deleted instead. Roles named like final call roles but neither
+    leased nor idle, e.g. ones left behind by a crash, are reclaimed by `sweep`.
+    """
+
+    def __init__(self, *, max_idle=_MAX_IDLE_ROLES_PER_GUILD, max_stripped=_MAX_STRIPPED_MEMBERS):
+        self.max_idle = max_idle
+        self.max_stripped = max_stripped
+        # Map guild id to role ids.
+        self.idle = defaultdict(list)
+        self.leased = defaultdict(set)
+
+    async def lease(self, guild, name):
+        idle = self.idle[guild.id]
+        while idle:
+            role = guild.get_role(idle.pop())
+            if role is None:
+                continue
+            self.leased[guild.id].add(role.id)
+            try:
+                for member in role.members:
+                    await member.remove_roles(role)
+                await role.edit(name=name, mentionable=True)
+                return role
+            except discord.HTTPException as e:
+                self.leased[guild.id].discard(role.id)
+                logger.warning(f'Failed to reuse pooled role {role.id} in guild {guild.id}: {e!r}')
+
+        role = await guild.create_role(name=name, mentionable=True)
+        self.leased[guild.id].add(role.id)
+        return role
+
+    async def release(self, role):
+        guild_id = role.guild.id
+        self.leased[guild_id].discard(role.id)
+        if len(self.idle[guild_id]) >= self.max_idle or len(role.members) > self.max_stripped:
+            await role.delete()
+            return
+        self.idle[guild_id].append(role.id)
+
+    async def sweep(self, guild, in_use_role_ids):
+        """Reclaims orphaned final call roles of the guild."""
+        reclaimed = 0
+        for role in guild.roles:
+            if (not role.name.startswith(FINALCALL_ROLE_PREFIX) or role.id in in_use_role_ids or
+                    role.id in self.leased[guild.id] or role.id in self.idle[guild.id]):
+                continue
+            try:
+                await self.release(role)
+                reclaimed += 1
+            except discord.HTTPException as e:
+                logger.warning(f'Failed to reclaim role {role.id} in guild {guild.id}: {e!r}')
+        return reclaimed
@@ -1,6 +1,7 @@
 import logging
 import datetime as dt
 from remind.util import website_schema
+from remind.util import tiers
 
 
 class Round:
@@ -11,6 +12,13 @@ class Round:
         self.url = contest['href']
         self.website = contest['resource']
         self.name = website_schema.schema[self.website].normalize(contest['event'])
+        # Changes whenever clist reports different details for the same contest id.
+        self.version = (contest['start'], contest['duration'], contest['href'], contest['event'])
+        # Per tier, the website's bit when the contest suits the tier and 0 otherwise,
+        # so that eligibility is a single AND with a guild's subscription bitmask.
+        site_bit = website_schema.website_bits.get(self.website, 0)
+        patterns = website_schema.schema[self.website]
+        self.tier_bits = tuple(site_bit if tier.matches(patterns, self.name) else 0 for tier in tiers.TIERS)
 
     def __str__(self):
         st = "ID = " + str(self.id) + ", "
@@ -29,15 +37,8 @@ class Round:
         schema = website_schema.schema[self.website]
         return schema.rare
 
-    def is_desired_for_div1(self, subscribed_websites):
-        if self.website not in subscribed_websites:
-            return False
-        return website_schema.schema[self.website].is_matched(self.name, for_all = False)
-
-    def is_desired_for_all(self, subscribed_websites):
-        if self.website not in subscribed_websites:
-            return False
-        return website_schema.schema[self.website].is_matched(self.name, for_all = True)
+    def is_desired(self, tier, subscribed_websites):
+        return bool(self.tier_bits[tier.index] & subscribed_websites)
 
     def __repr__(self):
         return "Round - " + self.name
@@ -0,0 +1,37 @@
+class Tier:
+    """A class of contests which guilds configure reminders and final calls for.
+
+    `matches` tells whether a contest of a website belongs to the tier, given the
+    website's `WebsitePatterns` and the contest name.
+    """
+
+    def __init__(self, name, *, index, matches, label, title, description):
+        self.name = name
+        # Position of the tier in the contest bits of `Round`.
+        self.index = index
+        self.matches = matches
+        # Inserted before "contests" in user facing text, e.g. "Future div1 contests".
+        self.label = label
+        self.title = title
+        self.description = description
+
+    def __repr__(self):
+        return f'Tier({self.name})'
+
+
+TIERS = []
+TIERS_BY_NAME = {}
+
+
+def register(name, matches, *, label, title, description):
+    """Adds a tier, its index is its position in the contest bits of `Round`."""
+    tier = Tier(name, index=len(TIERS), matches=matches, label=label, title=title, description=description)
+    TIERS.append(tier)
+    TIERS_BY_NAME[name] = tier
+    return tier
+
+
+DIV1 = register('div1', lambda patterns, name: patterns.is_matched(name, for_all=False),
+                label='div1 ', title='Div1', description='division 1')
+ALL = register('all', lambda patterns, name: patterns.is_matched(name, for_all=True),
+               label='', title='All', description='all')
@@ -0,0 +1,69 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+
+from remind.util import metrics
+
+logger = logging.getLogger(__name__)
+
+_HEARTBEAT_INTERVAL = 0.25  # seconds
+_DEFAULT_THRESHOLD = 0.5  # seconds
+
+_LOOP_LAG_SECONDS = metrics.histogram('remind_loop_lag_seconds', 'Event loop lag measured by the watchdog heartbeat',
+                                      buckets=(.001, .005, .01, .05, .1, .25, .5, 1, 2.5, 5, 10))
+_LOOP_STALLS = metrics.counter('remind_loop_stalls', 'Times a callback held the event loop over the threshold')
+
+
+class LoopWatchdog:
+    """Measures event loop lag and reports callbacks that block the loop.
+
+    A heartbeat coroutine measures how late its wakeups are. A watcher thread
+    notices when the heartbeat stops for longer than the threshold and captures
+    the stack of the loop thread, which the heartbeat logs once the loop is free
+    again so that the report also reaches the Discord log channel.
+    """
+
+    def __init__(self, *, threshold=_DEFAULT_THRESHOLD, interval=_HEARTBEAT_INTERVAL):
+        self.threshold = threshold
+        self.interval = interval
+        self.last_beat = time.monotonic()
+        self.lag = 0.0
+        self.loop_thread_id = None
+        self.blocked_stack = None
+        self.thread = None
+        metrics.gauge('remind_loop_lag_last_seconds', 'Most recent event loop lag', lambda: self.lag)
+
+    def start(self):
+        self.loop_thread_id = threading.get_ident()
+        self.last_beat = time.monotonic()
+        asyncio.create_task(self._heartbeat())
+        self.thread = threading.Thread(target=self._watch, name='loop-watchdog', daemon=True)
+        self.thread.start()
+
+    async def _heartbeat(self):
+        while True:
+            before = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self.last_beat = now
+            self.lag = max(0.0, now - before - self.interval)
+            _LOOP_LAG_SECONDS.observe(self.lag)
+
+            stack, self.blocked_stack = self.blocked_stack, None
+            if stack is not None:
+                _LOOP_STALLS.inc()
+                logger.warning(f'Event loop was blocked for {self.lag:.2f}s, '
+                               f'the loop thread was at:\n{stack}')
+
+    def _watch(self):
+        while True:
+            time.sleep(self.interval)
+            if self.blocked_stack is not None:
+                continue
+            if time.monotonic() - self.last_beat > self.threshold + self.interval:
+                frame = sys._current_frames().get(self.loop_thread_id)
+                if frame is not None:
+                    self.blocked_stack = ''.join(traceback.format_stack(frame))
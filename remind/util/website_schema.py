@@ -25,6 +25,21 @@ class WebsitePatterns:
 # Todo : Move these to external db
 supported_websites = ['codeforces.com', 'codechef.com', 'atcoder.jp', 'facebook.com/hackercup', 'tlx.toki.id']
 schema = defaultdict(WebsitePatterns)
+# Bit of each website in subscription bitmasks, saved settings rely on them so only ever append websites.
+website_bits = {website: 1 << index for index, website in enumerate(supported_websites)}
+ALL_WEBSITES_MASK = (1 << len(supported_websites)) - 1
+
+
+def websites_mask(websites):
+    mask = 0
+    for website in websites:
+        mask |= website_bits.get(website, 0)
+    return mask
+
+
+def mask_websites(mask):
+    return [website for website, bit in website_bits.items() if mask & bit]
+
 
 def _is_matched_for_codeforces(name, for_all = True):
     name = name.lower()